@@ -3,32 +3,76 @@
 lotto/cli.py
 
 prev=$(date -v-60d +%F); cur=$(date +%F); python lotto/cli.py check -s ${prev} -e ${cur} --db-path data/db/database.db --show-all-notifications
+python lotto/cli.py check --since-last --db-path data/db/database.db
 """
+
 import logging
+import multiprocessing
+import os
+import random
+import socket
 import sqlite3
-from typing import List, Optional
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import arrow
 import click
 
 from lotto import loggername
 from lotto.db import (
+    acquire_lease,
+    add_many_to_results_table,
     add_ticket_to_tickets_table,
-    add_to_schedule_table,
+    add_tickets_to_tickets_table,
+    check_index_exists,
     check_table_exists,
+    claim_schedule_pairs,
+    create_lease_table,
+    create_results_table,
     create_schedule_table,
     create_tickets_table,
+    create_watermark_table,
+    enable_wal_mode,
     get_connection,
-    query_schedule_table,
+    is_wal_mode,
+    lower_watermark_table,
+    query_results_summary,
+    query_results_table,
+    query_schedule_table_range,
+    query_ticket_key_range,
+    query_ticket_numbers,
+    query_ticket_start_dates,
     query_tickets_table,
+    query_unscored_schedule_pairs,
+    query_watermark_table,
+    release_lease,
+    update_watermark_table,
 )
 from lotto.drawings import DrawingLoader
+from lotto.games import get_game
+from lotto.generate import canonical_ticket, quick_picks, wheel
 from lotto.notify import send_notification, verify_credentials
-from lotto.tickets import TicketLoader
+from lotto.stats import (
+    BONUS_POOL,
+    MAIN_POOL,
+    create_stats_tables,
+    query_gap_histogram,
+    query_last_stats_draw,
+    query_number_counts,
+    query_overdue_numbers,
+    query_pair_counts,
+    update_stats_tables,
+)
+from lotto.tickets import LotteryTicket, TicketLoader, TicketResult
 
 logger = logging.getLogger(loggername())
 TICKET_TABLE_NAME = "TicketTable"
 SCHEDULE_TABLE_NAME = "ScheduleTable"
+WATERMARK_TABLE_NAME = "WatermarkTable"
+RESULTS_TABLE_NAME = "ResultsTable"
+LEASE_TABLE_NAME = "LeaseTable"
+CHECK_LEASE_NAME = "check"
+STATS_TABLE_PREFIX = "Stats"
 
 
 @click.command()
@@ -40,76 +84,117 @@ SCHEDULE_TABLE_NAME = "ScheduleTable"
 @click.option("--destination-email-address", type=str, multiple=True)
 @click.option("--db-path", type=str)
 @click.option("--show-all-notifications", is_flag=True)
+@click.option("--since-last", is_flag=True)
+@click.option("--workers", type=int, default=1)
+@click.option("--lease-ttl", type=int, default=3600)
+@click.option("--no-lease", is_flag=True)
 def check(
-    start_date: str,
-    end_date: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
     notify_email: bool,
     notify_email_address: Optional[str],
     notify_email_password: Optional[str],
     destination_email_address: Optional[List[str]],
     db_path: Optional[str] = None,
     show_all_notifications: Optional[bool] = None,
+    since_last: Optional[bool] = None,
+    workers: int = 1,
+    lease_ttl: int = 3600,
+    no_lease: bool = False,
 ) -> None:
+    """Check tickets against drawings and notify of results
+
+    Either check a fixed window (--start-date/--end-date), or use --since-last to
+    check only the drawings after each game's watermark (up to --end-date or today).
+    With --workers N, a fixed window is checked in TicketKey shards by N processes.
 
+    Each (ticket, drawing) pair is claimed atomically, so only the run that claims
+    a pair reports it. A run also holds the "check" lease, renewed for --lease-ttl
+    seconds after each game or shard, and exits if another live run holds it (or
+    takes it over); --no-lease skips the lease and relies on claims alone.
+    """
     logger.info("CHECK START")
-    if notify_email and not verify_credentials(
-        notify_email_address, notify_email_password
-    ):
-        raise ValueError("Env missing EMAIL_SEND_ADDRESS and/or EMAIL_SEND_PASSWORD")
+    _validate_check_options(
+        start_date,
+        end_date,
+        notify_email,
+        notify_email_address,
+        notify_email_password,
+        since_last,
+        workers,
+    )
 
     conn = get_connection(db_path)
     _validate_tables(conn)
 
-    notification_message = ""
-
-    #   Get Tickets
-    logger.debug(f"Checking for tickets between dates {start_date} - {end_date}")
-    tickets = query_tickets_table(
-        conn, TICKET_TABLE_NAME, arrow.get(start_date), arrow.get(end_date)
-    )
-    logger.debug(f"Found {len(tickets)} tickets : {tickets}")
-
-    #   Get Drawings
-    for ticket in tickets:
-        #   {"2022-11-21": [3, 5, 22, 45, 56, 3]}
-        assert ticket.ticket_id is not None
-        logger.debug(f"Checking ticket {ticket}")
-        drawing_class = DrawingLoader.load_drawing(
-            ticket.lotto_type.value, start_date, end_date
-        )
-        drawings = drawing_class.get_drawings()
-        for drawing_date in drawings.keys():
-            logger.debug(f"Checking drawing_date {drawing_date}")
-            ticket_checked = query_schedule_table(
-                conn, SCHEDULE_TABLE_NAME, ticket.ticket_id, arrow.get(drawing_date)
+    lease_owner: Optional[str] = None
+    if not no_lease:
+        lease_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    if lease_owner is not None and not acquire_lease(
+        conn, LEASE_TABLE_NAME, CHECK_LEASE_NAME, lease_owner, lease_ttl
+    ):
+        logger.info("Another check run holds the lease, exiting")
+        logger.info("CHECK END")
+        return
+    #   Filled as each batch is recorded, so a failed run still reports its claims
+    new_results: List[Tuple[LotteryTicket, TicketResult]] = []
+    try:
+        if since_last:
+            if end_date is None:
+                end_date = arrow.utcnow().format("YYYY-MM-DD")
+            start_date = _check_since_last(
+                conn, new_results, end_date, lease_owner, lease_ttl
             )
-            if ticket_checked and not show_all_notifications:
-                #   Don't add to message if ticket already checked
-                continue
-            notification_message += ticket.check_winnings(
-                drawing_date, drawings[drawing_date]
+        else:
+            assert start_date is not None and end_date is not None
+            _check_window(
+                conn,
+                new_results,
+                start_date,
+                end_date,
+                workers,
+                db_path,
+                lease_owner,
+                lease_ttl,
             )
-            if not ticket_checked:
-                add_to_schedule_table(
-                    conn, SCHEDULE_TABLE_NAME, ticket.ticket_id, arrow.get(drawing_date)
-                )
-
-    #   Notify
-    logger.info(f"NOTIFICATION: \n{notification_message}")
-
-    if notify_email and len(notification_message) > 0:
-        assert destination_email_address is not None
-        assert notify_email_address is not None
-        assert notify_email_password is not None
-        for destination_email in destination_email_address:
-            send_notification(
+    except Exception:
+        #   Claimed pairs are never reported by another run; report them now
+        if len(new_results) > 0:
+            logger.exception("Check failed, reporting results already recorded")
+            _notify(
+                _format_results(new_results),
+                f"New lottery drawings {start_date} - {end_date} (incomplete check)",
+                notify_email,
                 notify_email_address,
                 notify_email_password,
-                f"New lottery drawings {start_date} - {end_date}",
-                notification_message,
-                destination_email,
+                destination_email_address,
             )
+        raise
+    finally:
+        if lease_owner is not None:
+            release_lease(conn, LEASE_TABLE_NAME, CHECK_LEASE_NAME, lease_owner)
 
+    if show_all_notifications:
+        #   Already-checked pairs come straight from the results table
+        all_results = query_results_table(
+            conn,
+            RESULTS_TABLE_NAME,
+            TICKET_TABLE_NAME,
+            arrow.get(start_date),
+            arrow.get(end_date),
+        )
+        notification_message = _format_results(all_results)
+    else:
+        notification_message = _format_results(new_results)
+
+    _notify(
+        notification_message,
+        f"New lottery drawings {start_date} - {end_date}",
+        notify_email,
+        notify_email_address,
+        notify_email_password,
+        destination_email_address,
+    )
     logger.info("CHECK END")
 
 
@@ -146,9 +231,12 @@ def add(
     arrow.get(end_date)
     #   Validate info
     ticket = TicketLoader.load_ticket(lotto_name, start_date, end_date, numbers)
+    ticket.validate_numbers()
     logger.info(f"Validated ticket {ticket}")
 
     conn = get_connection(db_path)
+    _validate_tables(conn)
+    _lower_watermark(conn, lotto_name, start_date)
     add_ticket_to_tickets_table(
         conn, TICKET_TABLE_NAME, lotto_name, start_date, end_date, numbers
     )
@@ -156,13 +244,287 @@ def add(
 
 
 @click.command()
+@click.option("-l", "--lotto-name", type=str)
+@click.option("-s", "--start-date", type=str)
+@click.option("-e", "--end-date", type=str)
+@click.option("-c", "--count", type=int)
+@click.option("-n", "--numbers", type=int, multiple=True)
+@click.option("-g", "--guarantee", type=int, default=3)
+@click.option("-b", "--bonus", type=int)
+@click.option("--seed", type=int)
 @click.option("--db-path", type=str)
-def setup(db_path: str) -> None:
-    """Create tables in sqlite database"""
+def generate(
+    lotto_name: str,
+    start_date: str,
+    end_date: str,
+    count: Optional[int],
+    numbers: List[int],
+    guarantee: int,
+    bonus: Optional[int],
+    seed: Optional[int],
+    db_path: Optional[str] = None,
+) -> None:
+    """Generate and add many tickets: unique quick picks (--count), or a wheel
+    covering --numbers so that any --guarantee drawn numbers among them match
+    together on at least one ticket.  Tickets already held for the game in the
+    date range are never added again.
+    Examples:
+    python lotto/cli.py generate -l powerball -s 20221122 -e 20230127 -c 1000
+    python lotto/cli.py generate -l powerball -s 20221122 -e 20230127 \
+        -n 3 -n 8 -n 15 -n 21 -n 33 -n 42 -n 57 -n 64 -g 3 -b 7
+
+    Args:
+        lotto_name (str): [mega_millions|powerball|etc]
+        start_date (str): date that can be interpreted by arrow
+        end_date (str): date that can be interpreted by arrow
+        count (int, optional): number of quick picks
+        numbers (List[int]): main numbers to wheel
+        guarantee (int): wheel match guarantee
+        bonus (int, optional): bonus ball for wheel tickets; random if omitted
+        seed (int, optional): random seed for repeatable output
+        db_path (Optional[str], optional): /path/to/file.db (or use default).
+    """
+    logger.info("GENERATE START")
+    if (count is None) == (len(numbers) == 0):
+        raise ValueError("Provide exactly one of --count or --numbers")
+    spec = get_game(lotto_name)
+    rng = random.Random(seed)
+
+    conn = get_connection(db_path)
+    _validate_tables(conn)
+    held = {
+        canonical_ticket(map(int, numbers.split()))
+        for numbers in query_ticket_numbers(
+            conn,
+            TICKET_TABLE_NAME,
+            lotto_name,
+            arrow.get(start_date),
+            arrow.get(end_date),
+        )
+    }
+
+    if count is not None:
+        tickets = quick_picks(
+            count,
+            spec.main_count,
+            spec.main_max,
+            spec.bonus_max,
+            held,
+            rng,
+        )
+    else:
+        tickets = [
+            ticket
+            for ticket in wheel(
+                list(numbers),
+                spec.main_count,
+                guarantee,
+                bonus,
+                spec.bonus_max,
+                rng,
+            )
+            if ticket not in held
+        ]
+
+    #   Validate info
+    for ticket in tickets:
+        TicketLoader.load_ticket(
+            lotto_name, start_date, end_date, list(ticket)
+        ).validate_numbers()
+    _lower_watermark(conn, lotto_name, start_date)
+    add_tickets_to_tickets_table(
+        conn,
+        TICKET_TABLE_NAME,
+        lotto_name,
+        start_date,
+        end_date,
+        [list(ticket) for ticket in tickets],
+    )
+    logger.info(f"Added {len(tickets)} {lotto_name} tickets")
+    logger.info("GENERATE END")
+
+
+@click.command()
+@click.option("-s", "--start-date", type=str)
+@click.option("-e", "--end-date", type=str)
+@click.option("-t", "--ticket-id", type=int)
+@click.option("--summary", is_flag=True)
+@click.option("--db-path", type=str)
+def report(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    ticket_id: Optional[int],
+    summary: bool,
+    db_path: Optional[str] = None,
+) -> None:
+    """Report stored results without fetching drawings
+    Example (total won this year):
+    python lotto/cli.py report --summary
+
+    Args:
+        start_date (str, optional): first drawing date; default start of this year
+        end_date (str, optional): last drawing date; default today
+        ticket_id (int, optional): only report results for this ticket
+        summary (bool): per-game totals instead of per-drawing results
+        db_path (Optional[str], optional): /path/to/file.db (or use default).
+    """
+    logger.info("REPORT START")
+    start = (
+        arrow.utcnow().floor("year") if start_date is None else arrow.get(start_date)
+    )
+    end = arrow.utcnow() if end_date is None else arrow.get(end_date)
+
+    conn = get_connection(db_path)
+    _validate_tables(conn)
+
+    if summary:
+        rows = query_results_summary(
+            conn, RESULTS_TABLE_NAME, TICKET_TABLE_NAME, start, end
+        )
+        report_message = "".join(
+            [
+                f"{lotto_name} : {drawings} drawings, {checked} ticket checks, "
+                f"{wins} winning, total won ${total}\n"
+                for lotto_name, drawings, checked, wins, total in rows
+            ]
+        )
+    else:
+        report_message = _format_results(
+            query_results_table(
+                conn, RESULTS_TABLE_NAME, TICKET_TABLE_NAME, start, end, ticket_id
+            )
+        )
+    logger.info(f"REPORT {start.date()} - {end.date()}: \n{report_message}")
+    logger.info("REPORT END")
+
+
+@click.command()
+@click.option("-l", "--lotto-name", type=str)
+@click.option("-s", "--start-date", type=str, default="1990-01-01")
+@click.option("--top", type=int, default=10)
+@click.option("--no-update", is_flag=True)
+@click.option("--db-path", type=str)
+def stats(
+    lotto_name: str,
+    start_date: str,
+    top: int,
+    no_update: bool,
+    db_path: Optional[str] = None,
+) -> None:
+    """Show hot, cold and overdue numbers and frequent pairs for a game
+    New drawings are folded into the stats tables first, unless --no-update
+    Example:
+    python lotto/cli.py stats -l powerball --top 5
+
+    Args:
+        lotto_name (str): [mega_millions|powerball|etc]
+        start_date (str): earliest drawing to count when the game has no stats yet
+        top (int): numbers / pairs to show per list
+        no_update (bool): report from the stats tables without fetching drawings
+        db_path (Optional[str], optional): /path/to/file.db (or use default).
+    """
+    logger.info("STATS START")
+    conn = get_connection(db_path)
+    if not check_table_exists(conn, f"{STATS_TABLE_PREFIX}Numbers"):
+        raise RuntimeError("Stats Tables missing!  Run `lotto setup`")
+
+    if not no_update:
+        last_date, _ = query_last_stats_draw(conn, STATS_TABLE_PREFIX, lotto_name)
+        if last_date is not None:
+            start_date = last_date.shift(days=1).format("YYYY-MM-DD")
+        drawings = DrawingLoader.load_drawing(
+            lotto_name, start_date, arrow.utcnow().format("YYYY-MM-DD")
+        ).get_drawings()
+        added = update_stats_tables(conn, STATS_TABLE_PREFIX, lotto_name, drawings)
+        logger.info(f"Added {added} {lotto_name} drawings to stats")
+
+    stats_message = ""
+    for pool in (MAIN_POOL, BONUS_POOL):
+        hot = query_number_counts(conn, STATS_TABLE_PREFIX, lotto_name, pool, top)
+        cold = query_number_counts(
+            conn, STATS_TABLE_PREFIX, lotto_name, pool, top, hottest=False
+        )
+        overdue = query_overdue_numbers(conn, STATS_TABLE_PREFIX, lotto_name, pool, top)
+        gaps = query_gap_histogram(conn, STATS_TABLE_PREFIX, lotto_name, pool)
+        stats_message += f"{pool} hot (number, count): {hot}\n"
+        stats_message += f"{pool} cold (number, count): {cold}\n"
+        stats_message += (
+            f"{pool} overdue (number, drawings since, last seen): {overdue}\n"
+        )
+        stats_message += f"{pool} gaps (drawings, count): {gaps}\n"
+    pairs = query_pair_counts(conn, STATS_TABLE_PREFIX, lotto_name, top)
+    stats_message += f"pairs (number, number, count): {pairs}\n"
+    logger.info(f"STATS {lotto_name}: \n{stats_message}")
+    logger.info("STATS END")
+
+
+@click.command()
+@click.option("--host", type=str, default="127.0.0.1")
+@click.option("--port", type=int, default=8080)
+@click.option("--history-days", type=int, default=365)
+@click.option("--refresh-seconds", type=int, default=900)
+@click.option("--db-path", type=str)
+def serve(
+    host: str,
+    port: int,
+    history_days: int,
+    refresh_seconds: int,
+    db_path: Optional[str] = None,
+) -> None:
+    """Serve ticket checks over HTTP from an in-memory drawing cache
+    Example:
+    python lotto/cli.py serve --port 8080
+    curl 'localhost:8080/check?lotto_name=powerball&numbers=1,6,40,3,4,2'
+
+    Args:
+        host (str): interface to bind
+        port (int): port to bind
+        history_days (int): days of drawings to keep in memory
+        refresh_seconds (int): seconds between background drawing refreshes
+        db_path (Optional[str], optional): /path/to/file.db (or use default).
+    """
+    logger.info("SERVE START")
+    #   Only serve needs asyncio; keep it out of every other command's startup
+    import asyncio
+
+    from lotto.server import DrawingCache, LottoServer
+
+    conn = get_connection(db_path)
+    _validate_tables(conn)
+    server = LottoServer(
+        conn,
+        TICKET_TABLE_NAME,
+        RESULTS_TABLE_NAME,
+        DrawingCache(history_days, refresh_seconds),
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    logger.info("SERVE END")
+
+
+@click.command()
+@click.option("--wal", is_flag=True)
+@click.option("--db-path", type=str)
+def setup(wal: bool, db_path: str) -> None:
+    """Create tables in sqlite database, and store results for pairs checked
+    before the results table existed (fetching their drawings)
+    --wal switches the file to write-ahead logging, so check --workers readers
+    and the writer stop blocking each other.  Not for databases on network
+    storage, where SQLite's WAL mode does not work.
+    """
     logger.info("SETUP START")
     conn = get_connection(db_path)
+    if wal:
+        enable_wal_mode(conn)
     create_tickets_table(conn, TICKET_TABLE_NAME)
     create_schedule_table(conn, SCHEDULE_TABLE_NAME)
+    create_watermark_table(conn, WATERMARK_TABLE_NAME)
+    create_results_table(conn, RESULTS_TABLE_NAME)
+    create_lease_table(conn, LEASE_TABLE_NAME)
+    create_stats_tables(conn, STATS_TABLE_PREFIX)
+    _backfill_results(conn)
     logger.info("SETUP END")
 
 
@@ -191,6 +553,10 @@ def commands(verbose: bool = False) -> None:
 commands.add_command(check)
 commands.add_command(add)
 commands.add_command(setup)
+commands.add_command(report)
+commands.add_command(serve)
+commands.add_command(stats)
+commands.add_command(generate)
 
 
 def _validate_tables(conn: sqlite3.Connection) -> None:
@@ -199,6 +565,448 @@ def _validate_tables(conn: sqlite3.Connection) -> None:
         raise RuntimeError("Ticket Table missing!  Run `lotto setup`")
     if not check_table_exists(conn, SCHEDULE_TABLE_NAME):
         raise RuntimeError("Check Table missing!  Run `lotto setup`")
+    if not check_table_exists(conn, WATERMARK_TABLE_NAME):
+        raise RuntimeError("Watermark Table missing!  Run `lotto setup`")
+    if not check_table_exists(conn, RESULTS_TABLE_NAME):
+        raise RuntimeError("Results Table missing!  Run `lotto setup`")
+    if not check_table_exists(conn, LEASE_TABLE_NAME):
+        raise RuntimeError("Lease Table missing!  Run `lotto setup`")
+    if not check_index_exists(conn, f"{SCHEDULE_TABLE_NAME}Claim"):
+        raise RuntimeError("Schedule Table claim index missing!  Run `lotto setup`")
+
+
+def _backfill_results(conn: sqlite3.Connection) -> None:
+    """Evaluate and store results for scheduled pairs that have none, so
+    re-reports and report --summary cover pairs checked by older versions.
+    Pairs outside a ticket's own dates get no result, as in current checks
+    """
+    pairs_by_game: Dict[str, List[Tuple[LotteryTicket, arrow.Arrow]]] = {}
+    for ticket, schedule_date in query_unscored_schedule_pairs(
+        conn, SCHEDULE_TABLE_NAME, TICKET_TABLE_NAME, RESULTS_TABLE_NAME
+    ):
+        draw_date = arrow.get(schedule_date, "YYYYMMDD")
+        if ticket.start_date <= draw_date <= ticket.end_date:
+            pairs_by_game.setdefault(ticket.lotto_name, []).append((ticket, draw_date))
+
+    for lotto_name, pairs in pairs_by_game.items():
+        first = min(draw_date for _, draw_date in pairs).format("YYYY-MM-DD")
+        last = max(draw_date for _, draw_date in pairs).format("YYYY-MM-DD")
+        drawing_class = DrawingLoader.load_drawing(lotto_name, first, last)
+        drawings = drawing_class.get_drawings()
+        results: List[TicketResult] = []
+        for ticket, draw_date in pairs:
+            drawing_date = draw_date.format("YYYY-MM-DD")
+            if drawing_date not in drawings:
+                continue
+            results.append(
+                ticket.evaluate(
+                    drawing_date,
+                    drawings[drawing_date],
+                    drawing_class.multipliers.get(drawing_date),
+                )
+            )
+        with conn:
+            add_many_to_results_table(conn, RESULTS_TABLE_NAME, results)
+        logger.info(f"Backfilled {len(results)} {lotto_name} results")
+
+
+def _validate_check_options(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    notify_email: bool,
+    notify_email_address: Optional[str],
+    notify_email_password: Optional[str],
+    since_last: Optional[bool],
+    workers: int,
+) -> None:
+    """Raise exception if check options are missing or conflict"""
+    if notify_email and not verify_credentials(
+        notify_email_address, notify_email_password
+    ):
+        raise ValueError("Env missing EMAIL_SEND_ADDRESS and/or EMAIL_SEND_PASSWORD")
+    if not since_last and (start_date is None or end_date is None):
+        raise ValueError("--start-date and --end-date required without --since-last")
+    if since_last and workers > 1:
+        raise ValueError("--workers is only supported with --start-date/--end-date")
+
+
+def _check_window(
+    conn: sqlite3.Connection,
+    new_results: List[Tuple[LotteryTicket, TicketResult]],
+    start_date: str,
+    end_date: str,
+    workers: int = 1,
+    db_path: Optional[str] = None,
+    lease_owner: Optional[str] = None,
+    lease_ttl: int = 3600,
+) -> None:
+    """Check tickets against every drawing between start_date and end_date
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection
+        new_results (List[Tuple[LotteryTicket, TicketResult]]): extended with
+            newly evaluated results as each batch is recorded
+        start_date (str): first drawing date to check
+        end_date (str): last drawing date to check
+        workers (int, optional): worker processes; more than 1 shards the tickets
+        db_path (Optional[str], optional): path to file.db, opened by workers
+        lease_owner (Optional[str], optional): check lease to renew as work
+            progresses; None if running without a lease
+        lease_ttl (int, optional): seconds each lease renewal lasts
+    """
+    if workers > 1:
+        _check_window_parallel(
+            conn,
+            new_results,
+            start_date,
+            end_date,
+            workers,
+            db_path,
+            lease_owner,
+            lease_ttl,
+        )
+        return
+
+    #   Get Tickets
+    logger.debug(f"Checking for tickets between dates {start_date} - {end_date}")
+    tickets = query_tickets_table(
+        conn, TICKET_TABLE_NAME, arrow.get(start_date), arrow.get(end_date)
+    )
+    logger.debug(f"Found {len(tickets)} tickets : {tickets}")
+    checked = query_schedule_table_range(
+        conn, SCHEDULE_TABLE_NAME, arrow.get(start_date), arrow.get(end_date)
+    )
+
+    #   Get Drawings, once per game
+    tickets_by_game: Dict[str, List[LotteryTicket]] = {}
+    for ticket in tickets:
+        tickets_by_game.setdefault(ticket.lotto_name, []).append(ticket)
+
+    for lotto_name, game_tickets in tickets_by_game.items():
+        drawing_class = DrawingLoader.load_drawing(lotto_name, start_date, end_date)
+        drawings = drawing_class.get_drawings()
+        game_results = _evaluate_drawings(
+            game_tickets, drawings, drawing_class.multipliers, checked
+        )
+        new_results += _record_results(conn, game_results)
+        _renew_lease(conn, lease_owner, lease_ttl)
+
+
+def _check_window_parallel(
+    conn: sqlite3.Connection,
+    new_results: List[Tuple[LotteryTicket, TicketResult]],
+    start_date: str,
+    end_date: str,
+    workers: int,
+    db_path: Optional[str],
+    lease_owner: Optional[str] = None,
+    lease_ttl: int = 3600,
+) -> None:
+    """Check tickets in TicketKey-range shards across worker processes
+    Workers read through their own connections; this process is the only writer
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection used for writing
+        new_results (List[Tuple[LotteryTicket, TicketResult]]): extended with
+            newly evaluated results as each shard is recorded
+        start_date (str): first drawing date to check
+        end_date (str): last drawing date to check
+        workers (int): number of worker processes
+        db_path (Optional[str]): path to file.db; default if None
+        lease_owner (Optional[str], optional): check lease to renew after each
+            shard; None if running without a lease
+        lease_ttl (int, optional): seconds each lease renewal lasts
+    """
+    key_range = query_ticket_key_range(conn, TICKET_TABLE_NAME)
+    if key_range is None:
+        return
+    if not is_wal_mode(conn):
+        logger.info("Workers wait on each write; `lotto setup --wal` lets them overlap")
+
+    #   Drawings are fetched once here and shared with every worker
+    drawings_by_game: Dict[str, Tuple[Dict[str, List[int]], Dict[str, Optional[int]]]]
+    drawings_by_game = {}
+    for lotto_name in query_ticket_start_dates(conn, TICKET_TABLE_NAME).keys():
+        drawing_class = DrawingLoader.load_drawing(lotto_name, start_date, end_date)
+        drawings = drawing_class.get_drawings()
+        drawings_by_game[lotto_name] = (drawings, drawing_class.multipliers)
+
+    #   Several shards per worker keeps workers busy when shards are uneven
+    first, last = key_range
+    shard_count = workers * 4
+    shard_size = max(1, -(-(last - first + 1) // shard_count))
+    shards = [
+        (shard_start, min(shard_start + shard_size - 1, last))
+        for shard_start in range(first, last + 1, shard_size)
+    ]
+    logger.debug(f"Checking {len(shards)} shards of {shard_size} keys")
+
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_check_worker,
+        initargs=(db_path, start_date, end_date, drawings_by_game),
+    ) as pool:
+        for shard_results in pool.imap_unordered(_check_shard, shards):
+            new_results += _record_results(conn, shard_results)
+            _renew_lease(conn, lease_owner, lease_ttl)
+
+
+#   Per-process state for check workers, set by _init_check_worker
+_check_worker: Dict[str, Any] = {}
+
+
+def _init_check_worker(
+    db_path: Optional[str],
+    start_date: str,
+    end_date: str,
+    drawings_by_game: Dict[str, Tuple[Dict[str, List[int]], Dict[str, Optional[int]]]],
+) -> None:
+    _check_worker["conn"] = get_connection(db_path, read_only=True)
+    _check_worker["start_date"] = arrow.get(start_date)
+    _check_worker["end_date"] = arrow.get(end_date)
+    _check_worker["drawings_by_game"] = drawings_by_game
+
+
+def _check_shard(
+    key_range: Tuple[int, int]
+) -> List[Tuple[LotteryTicket, TicketResult]]:
+    """Evaluate the tickets with TicketKey in key_range (runs in a worker)"""
+    conn = _check_worker["conn"]
+    start_date = _check_worker["start_date"]
+    end_date = _check_worker["end_date"]
+    tickets = query_tickets_table(
+        conn, TICKET_TABLE_NAME, start_date, end_date, key_range
+    )
+    checked = query_schedule_table_range(
+        conn, SCHEDULE_TABLE_NAME, start_date, end_date, key_range
+    )
+    tickets_by_game: Dict[str, List[LotteryTicket]] = {}
+    for ticket in tickets:
+        tickets_by_game.setdefault(ticket.lotto_name, []).append(ticket)
+
+    results: List[Tuple[LotteryTicket, TicketResult]] = []
+    for lotto_name, game_tickets in tickets_by_game.items():
+        drawings, multipliers = _check_worker["drawings_by_game"][lotto_name]
+        results += _evaluate_drawings(game_tickets, drawings, multipliers, checked)
+    return results
+
+
+def _check_since_last(
+    conn: sqlite3.Connection,
+    new_results: List[Tuple[LotteryTicket, TicketResult]],
+    end_date: str,
+    lease_owner: Optional[str] = None,
+    lease_ttl: int = 3600,
+) -> str:
+    """Check only drawings after each game's watermark, advancing the watermarks
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection
+        new_results (List[Tuple[LotteryTicket, TicketResult]]): extended with
+            newly evaluated results as each game is recorded
+        end_date (str): last drawing date to check
+        lease_owner (Optional[str], optional): check lease to renew after each
+            game; None if running without a lease
+        lease_ttl (int, optional): seconds each lease renewal lasts
+
+    Returns:
+        str: earliest drawing date checked
+    """
+    earliest_start = end_date
+    for lotto_name, first_ticket_date in query_ticket_start_dates(
+        conn, TICKET_TABLE_NAME
+    ).items():
+        #   Advanced at the end only if still this value; add may lower it meanwhile
+        watermark = query_watermark_table(conn, WATERMARK_TABLE_NAME, lotto_name)
+        start = first_ticket_date if watermark is None else watermark.shift(days=1)
+        if start > arrow.get(end_date):
+            logger.debug(f"No new {lotto_name} drawings since {watermark}")
+            continue
+
+        #   {"2022-11-21": [3, 5, 22, 45, 56, 3]}
+        drawing_class = DrawingLoader.load_drawing(
+            lotto_name, start.format("YYYY-MM-DD"), end_date
+        )
+        drawings = drawing_class.get_drawings()
+        if len(drawings) == 0:
+            continue
+        draw_dates = sorted(drawings.keys())
+        earliest_start = min(earliest_start, draw_dates[0])
+        logger.debug(f"Checking {lotto_name} drawings {draw_dates}")
+
+        tickets = query_tickets_table(
+            conn,
+            TICKET_TABLE_NAME,
+            arrow.get(draw_dates[0]),
+            arrow.get(draw_dates[-1]),
+            lotto_name=lotto_name,
+        )
+        checked = query_schedule_table_range(
+            conn,
+            SCHEDULE_TABLE_NAME,
+            arrow.get(draw_dates[0]),
+            arrow.get(draw_dates[-1]),
+        )
+        game_results = _evaluate_drawings(
+            tickets, drawings, drawing_class.multipliers, checked
+        )
+        new_results += _record_results(
+            conn, game_results, lotto_name, arrow.get(draw_dates[-1]), watermark
+        )
+        _renew_lease(conn, lease_owner, lease_ttl)
+    return earliest_start
+
+
+def _evaluate_drawings(
+    tickets: List[LotteryTicket],
+    drawings: Dict[str, List[int]],
+    multipliers: Dict[str, Optional[int]],
+    checked: Set[Tuple[int, str]],
+) -> List[Tuple[LotteryTicket, TicketResult]]:
+    """Evaluate every (ticket, drawing) pair not already in the schedule table,
+    skipping drawings outside each ticket's start/end dates
+
+    Args:
+        tickets (List[LotteryTicket]): tickets for a single game
+        drawings (Dict[str, List[int]]): {"2022-11-21": [3, 5, 22, 45, 56, 3]}
+        multipliers (Dict[str, Optional[int]]): multiplier per drawing date
+        checked (Set[Tuple[int, str]]): (ticket_id, "YYYYMMDD") already scheduled
+
+    Returns:
+        List[Tuple[LotteryTicket, TicketResult]]: newly evaluated results
+    """
+    draw_dates = {drawing_date: arrow.get(drawing_date) for drawing_date in drawings}
+    results: List[Tuple[LotteryTicket, TicketResult]] = []
+    for ticket in tickets:
+        assert ticket.ticket_id is not None
+        for drawing_date, draw_date in draw_dates.items():
+            if not ticket.start_date <= draw_date <= ticket.end_date:
+                continue
+            if (ticket.ticket_id, draw_date.strftime("%Y%m%d")) in checked:
+                continue
+            result = ticket.evaluate(
+                drawing_date, drawings[drawing_date], multipliers.get(drawing_date)
+            )
+            results.append((ticket, result))
+    return results
+
+
+def _record_results(
+    conn: sqlite3.Connection,
+    results: List[Tuple[LotteryTicket, TicketResult]],
+    lotto_name: Optional[str] = None,
+    watermark: Optional[arrow.Arrow] = None,
+    expected_watermark: Optional[arrow.Arrow] = None,
+) -> List[Tuple[LotteryTicket, TicketResult]]:
+    """Claim schedule rows, then write results for the claimed pairs and
+    (optionally) advance a game's watermark from expected_watermark, all in one
+    transaction
+
+    Returns:
+        List[Tuple[LotteryTicket, TicketResult]]: results whose (ticket, drawing)
+            pair this run claimed; pairs claimed by a concurrent run are dropped
+    """
+    draw_dates = {
+        drawing_date: arrow.get(drawing_date)
+        for drawing_date in {result.drawing_date for _, result in results}
+    }
+    with conn:
+        claimed = claim_schedule_pairs(
+            conn,
+            SCHEDULE_TABLE_NAME,
+            [
+                (ticket.ticket_id, draw_dates[result.drawing_date])
+                for ticket, result in results
+                if ticket.ticket_id is not None
+            ],
+        )
+        claimed_results = [
+            (ticket, result)
+            for ticket, result in results
+            if (
+                ticket.ticket_id,
+                draw_dates[result.drawing_date].strftime("%Y%m%d"),
+            )
+            in claimed
+        ]
+        add_many_to_results_table(
+            conn, RESULTS_TABLE_NAME, [result for _, result in claimed_results]
+        )
+        if (
+            lotto_name is not None
+            and watermark is not None
+            and not update_watermark_table(
+                conn, WATERMARK_TABLE_NAME, lotto_name, watermark, expected_watermark
+            )
+        ):
+            logger.info(f"{lotto_name} watermark changed during the run, kept as is")
+    if len(claimed_results) < len(results):
+        logger.info(
+            f"Skipped {len(results) - len(claimed_results)} pairs claimed by another run"
+        )
+    return claimed_results
+
+
+def _lower_watermark(
+    conn: sqlite3.Connection, lotto_name: str, start_date: str
+) -> None:
+    """Make --since-last also check drawings the watermark has already passed.
+    A game without a watermark gets one just before its earliest ticket, so an
+    in-flight first run cannot advance past the new ticket
+    Does not commit; callers group this with the tickets being added
+    """
+    first_date = arrow.get(start_date)
+    if query_watermark_table(conn, WATERMARK_TABLE_NAME, lotto_name) is None:
+        first_ticket_date = query_ticket_start_dates(conn, TICKET_TABLE_NAME).get(
+            lotto_name
+        )
+        if first_ticket_date is not None:
+            first_date = min(first_date, first_ticket_date)
+    lower_watermark_table(
+        conn, WATERMARK_TABLE_NAME, lotto_name, first_date.shift(days=-1)
+    )
+
+
+def _renew_lease(
+    conn: sqlite3.Connection, lease_owner: Optional[str], lease_ttl: int
+) -> None:
+    """Extend the check lease; stop the run if another run has taken it over"""
+    if lease_owner is None:
+        return
+    if not acquire_lease(
+        conn, LEASE_TABLE_NAME, CHECK_LEASE_NAME, lease_owner, lease_ttl
+    ):
+        raise RuntimeError("Lost the check lease to another run, stopping")
+
+
+def _format_results(results: List[Tuple[LotteryTicket, TicketResult]]) -> str:
+    """Build the notification message for evaluated results"""
+    return "".join([ticket.format_result(result) for ticket, result in results])
+
+
+def _notify(
+    notification_message: str,
+    notification_subject: str,
+    notify_email: bool,
+    notify_email_address: Optional[str],
+    notify_email_password: Optional[str],
+    destination_email_address: Optional[List[str]],
+) -> None:
+    """Log the notification message and email it if requested"""
+    logger.info(f"NOTIFICATION: \n{notification_message}")
+
+    if notify_email and len(notification_message) > 0:
+        assert destination_email_address is not None
+        assert notify_email_address is not None
+        assert notify_email_password is not None
+        for destination_email in destination_email_address:
+            send_notification(
+                notify_email_address,
+                notify_email_password,
+                notification_subject,
+                notification_message,
+                destination_email,
+            )
 
 
 if __name__ == "__main__":
@@ -4,28 +4,59 @@ lotto/db/__init__.py
 import logging
 import os
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 import arrow
 
 from lotto import basedir, loggername
-from lotto.tickets import LotteryTicket, TicketLoader
+from lotto.tickets import LotteryTicket, TicketLoader, TicketResult
 
 logger = logging.getLogger(loggername())
 
 
-def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+def get_connection(
+    db_path: Optional[str] = None, read_only: bool = False
+) -> sqlite3.Connection:
     """Get sqlite3 connection
 
     Args:
         db_path (Optional[str], optional): path to file.db; default if None
+        read_only (bool, optional): open the file read-only (e.g. check workers)
 
     Returns:
         sqlite3.Connection: sqlite3 connection to a database file
     """
     if db_path is None:
         db_path = _get_db_path()
-    return sqlite3.connect(db_path)
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(db_path)
+    #   Wait on a busy writer rather than failing; these are per-connection
+    conn.execute("PRAGMA busy_timeout = 30000")
+    if is_wal_mode(conn):
+        #   Safe in WAL mode only; rollback journals keep the FULL default
+        conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    return conn
+
+
+def enable_wal_mode(conn: sqlite3.Connection) -> None:
+    """Switch the database file to write-ahead logging
+    Persists in the file, so readers and the writer stop blocking each other.
+    WAL needs shared memory, so do not use it on network filesystems
+    """
+    journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    if journal_mode.lower() != "wal":
+        logger.warning(f"Could not enable WAL mode, journal_mode is {journal_mode}")
+        return
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def is_wal_mode(conn: sqlite3.Connection) -> bool:
+    """Check to see if the database file uses write-ahead logging"""
+    return conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
 
 
 def create_tickets_table(conn: sqlite3.Connection, ticket_table_name: str) -> None:
@@ -60,11 +91,34 @@ def add_ticket_to_tickets_table(
     conn.commit()
 
 
+def add_tickets_to_tickets_table(
+    conn: sqlite3.Connection,
+    ticket_table_name: str,
+    lotto_name: str,
+    start_date: str,
+    end_date: str,
+    all_numbers: List[List[int]],
+) -> None:
+    """Add many tickets for one game and date range in a single transaction"""
+    sql = f"""INSERT INTO {ticket_table_name} (LottoName, StartDate, EndDate, Numbers)
+        VALUES (?, ?, ?, ?)"""
+    with conn:
+        conn.executemany(
+            sql,
+            [
+                (lotto_name, start_date, end_date, " ".join([str(x) for x in numbers]))
+                for numbers in all_numbers
+            ],
+        )
+
+
 def query_tickets_table(
     conn: sqlite3.Connection,
     ticket_table: str,
     start_date: arrow.Arrow,
     end_date: arrow.Arrow,
+    key_range: Optional[Tuple[int, int]] = None,
+    lotto_name: Optional[str] = None,
 ) -> List[LotteryTicket]:
     """Get Lottery Tickets in date range
 
@@ -72,62 +126,131 @@ def query_tickets_table(
         conn (sqlite3.Connection): sqlite connection
         start_date (arrow.Arrow): ticket query start date
         end_date (arrow.Arrow): ticket query start date
+        key_range (Tuple[int, int], optional): only TicketKeys in [first, last]
+        lotto_name (str, optional): only tickets for this game
 
     Returns:
-        LotteryTicket: [PowerballTicket|MegaMillionsTicket|etc]
+        List[LotteryTicket]: tickets for any registered game
     """
     sql = f"""SELECT * from {ticket_table}"""
+    conditions: List[str] = []
+    params: List[object] = []
+    if key_range is not None:
+        conditions.append("TicketKey BETWEEN ? AND ?")
+        params += key_range
+    if lotto_name is not None:
+        conditions.append("LottoName = ?")
+        params.append(lotto_name)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
     #   Results like:
     #   [(1, 'powerball', '20221122', '20230127', '6 11 13 28 47 25'),
-    cursor = conn.execute(sql)
-    results = cursor.fetchall()
+    cursor = conn.execute(sql, params)
+    overlaps: Dict[Tuple[str, str], bool] = {}
     all_tickets: List[LotteryTicket] = []
-    logger.debug(f"query_tickets_table results {results}")
-    for result in results:
-        ticket = TicketLoader.load_ticket(
-            lotto_name=result[1],
-            start_date=result[2],
-            end_date=result[3],
-            numbers=[int(x) for x in result[4].split(" ")],
-            ticket_id=result[0],
+    for result in cursor:
+        #   Only tickets overlapping the date range are loaded
+        if not _overlaps(overlaps, result[2], result[3], start_date, end_date):
+            continue
+        all_tickets.append(
+            TicketLoader.load_ticket(
+                lotto_name=result[1],
+                start_date=result[2],
+                end_date=result[3],
+                numbers=[int(x) for x in result[4].split(" ")],
+                ticket_id=result[0],
+            )
         )
-        #   Check for overlap
-        if (
-            start_date <= ticket.start_date <= end_date
-            or start_date <= ticket.end_date <= end_date
-            or (ticket.start_date <= start_date and ticket.end_date >= end_date)
-        ):
-            all_tickets.append(ticket)
+    logger.debug(f"query_tickets_table found {len(all_tickets)} tickets")
     return all_tickets
 
 
-def query_schedule_table(
+def query_ticket(
+    conn: sqlite3.Connection, ticket_table: str, ticket_id: int
+) -> Optional[LotteryTicket]:
+    """Get one ticket by TicketKey, or None if there is no such ticket"""
+    sql = f"""SELECT * from {ticket_table} where TicketKey=?"""
+    result = conn.execute(sql, (ticket_id,)).fetchone()
+    if result is None:
+        return None
+    return TicketLoader.load_ticket(
+        lotto_name=result[1],
+        start_date=result[2],
+        end_date=result[3],
+        numbers=[int(x) for x in result[4].split(" ")],
+        ticket_id=result[0],
+    )
+
+
+def query_ticket_numbers(
+    conn: sqlite3.Connection,
+    ticket_table: str,
+    lotto_name: str,
+    start_date: arrow.Arrow,
+    end_date: arrow.Arrow,
+) -> List[str]:
+    """Get the raw Numbers of a game's tickets overlapping the date range,
+    without building a LotteryTicket for each row
+
+    Returns:
+        List[str]: like ['6 11 13 28 47 25', ...]
+    """
+    sql = f"""SELECT StartDate, EndDate, Numbers from {ticket_table}
+        WHERE LottoName=?"""
+    overlaps: Dict[Tuple[str, str], bool] = {}
+    return [
+        numbers
+        for ticket_start, ticket_end, numbers in conn.execute(sql, (lotto_name,))
+        if _overlaps(overlaps, ticket_start, ticket_end, start_date, end_date)
+    ]
+
+
+def query_schedule_table_range(
     conn: sqlite3.Connection,
     schedule_table: str,
-    ticket_id: int,
-    check_date: arrow.Arrow,
-) -> bool:
-    """Check to see if a ticket is already in the schedule table"""
-    schedule_date = check_date.strftime("%Y%m%d")
-    sql = f"""SELECT * from {schedule_table} where TicketKey={ticket_id} \
-        and ScheduleDate='{schedule_date}'"""
-    cursor = conn.execute(sql)
-    results = cursor.fetchall()
-    return len(results) > 0
+    start_date: arrow.Arrow,
+    end_date: arrow.Arrow,
+    key_range: Optional[Tuple[int, int]] = None,
+) -> Set[Tuple[int, str]]:
+    """Get every (ticket_id, "YYYYMMDD") pair already scheduled in date range"""
+    sql = f"""SELECT TicketKey, ScheduleDate from {schedule_table}
+        WHERE ScheduleDate BETWEEN ? AND ?"""
+    params: Tuple[object, ...] = (
+        start_date.strftime("%Y%m%d"),
+        end_date.strftime("%Y%m%d"),
+    )
+    if key_range is not None:
+        #   TicketKey is stored as text in the schedule table
+        sql += " AND CAST(TicketKey AS INTEGER) BETWEEN ? AND ?"
+        params += key_range
+    cursor = conn.execute(sql, params)
+    return {(int(ticket_id), schedule_date) for ticket_id, schedule_date in cursor}
 
 
-def add_to_schedule_table(
+def claim_schedule_pairs(
     conn: sqlite3.Connection,
     schedule_table: str,
-    ticket_id: int,
-    check_date: arrow.Arrow,
-) -> None:
-    """Check to see if a ticket is already in the schedule table"""
-    schedule_date = check_date.strftime("%Y%m%d")
-    sql = f"""INSERT INTO {schedule_table} (ScheduleDate, TicketKey)
-        VALUES ('{schedule_date}', {ticket_id})"""
-    conn.execute(sql)
-    conn.commit()
+    schedule_rows: List[Tuple[int, arrow.Arrow]],
+) -> Set[Tuple[int, str]]:
+    """Claim (ticket_id, check_date) pairs in the schedule table
+    Pairs already claimed by another run are skipped by the unique index.
+    Does not commit; callers group this with other writes in a single transaction
+
+    Returns:
+        Set[Tuple[int, str]]: (ticket_id, "YYYYMMDD") pairs claimed by this call
+    """
+    sql = f"""INSERT OR IGNORE INTO {schedule_table} (ScheduleDate, TicketKey)
+        VALUES (?, ?)"""
+    schedule_dates = {
+        check_date: check_date.strftime("%Y%m%d")
+        for check_date in {check_date for _, check_date in schedule_rows}
+    }
+    claimed: Set[Tuple[int, str]] = set()
+    for ticket_id, check_date in schedule_rows:
+        schedule_date = schedule_dates[check_date]
+        if conn.execute(sql, (schedule_date, ticket_id)).rowcount == 1:
+            claimed.add((ticket_id, schedule_date))
+    return claimed
 
 
 def create_schedule_table(conn: sqlite3.Connection, schedule_table_name: str) -> None:
@@ -138,6 +261,341 @@ def create_schedule_table(conn: sqlite3.Connection, schedule_table_name: str) ->
         );
     """
     conn.execute(sql)
+    #   Claims rely on a unique key; drop duplicates left by older, unclaimed runs
+    conn.execute(
+        f"""DELETE FROM {schedule_table_name} WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM {schedule_table_name}
+            GROUP BY ScheduleDate, TicketKey)"""
+    )
+    conn.execute(f"""DROP INDEX IF EXISTS {schedule_table_name}ScheduleDate""")
+    conn.execute(
+        f"""CREATE UNIQUE INDEX IF NOT EXISTS {schedule_table_name}Claim
+        ON {schedule_table_name} (ScheduleDate, TicketKey)"""
+    )
+    conn.commit()
+
+
+def create_results_table(conn: sqlite3.Connection, results_table_name: str) -> None:
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {results_table_name} (
+            TicketKey INTEGER,
+            DrawDate varchar(255),
+            WinningNumbers varchar(255),
+            Matches INTEGER,
+            BonusHit INTEGER,
+            Multiplier INTEGER,
+            Prize INTEGER,
+            PRIMARY KEY (TicketKey, DrawDate)
+        );
+    """
+    conn.execute(sql)
+    conn.execute(
+        f"""CREATE INDEX IF NOT EXISTS {results_table_name}DrawDate
+        ON {results_table_name} (DrawDate, TicketKey)"""
+    )
+
+
+def add_many_to_results_table(
+    conn: sqlite3.Connection,
+    results_table: str,
+    results: List[TicketResult],
+) -> None:
+    """Add evaluated ticket results in one statement
+    Does not commit; callers group this with the matching schedule rows
+    """
+    sql = f"""INSERT OR REPLACE INTO {results_table} (TicketKey, DrawDate,
+        WinningNumbers, Matches, BonusHit, Multiplier, Prize)
+        VALUES (?, ?, ?, ?, ?, ?, ?)"""
+    draw_dates = {
+        drawing_date: arrow.get(drawing_date).strftime("%Y%m%d")
+        for drawing_date in {result.drawing_date for result in results}
+    }
+    conn.executemany(
+        sql,
+        [
+            (
+                result.ticket_id,
+                draw_dates[result.drawing_date],
+                " ".join([str(x) for x in result.winning_numbers]),
+                result.matches,
+                int(result.bonus_hit),
+                result.multiplier,
+                result.prize,
+            )
+            for result in results
+        ],
+    )
+
+
+def query_results_table(
+    conn: sqlite3.Connection,
+    results_table: str,
+    ticket_table: str,
+    start_date: arrow.Arrow,
+    end_date: arrow.Arrow,
+    ticket_id: Optional[int] = None,
+) -> List[Tuple[LotteryTicket, TicketResult]]:
+    """Get stored results for drawings in date range, without re-evaluating
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection
+        results_table (str): results table name
+        ticket_table (str): ticket table name
+        start_date (arrow.Arrow): first drawing date
+        end_date (arrow.Arrow): last drawing date
+        ticket_id (int, optional): only results for this ticket
+
+    Returns:
+        List[Tuple[LotteryTicket, TicketResult]]: ordered by ticket, drawing date
+    """
+    sql = f"""SELECT t.TicketKey, t.LottoName, t.StartDate, t.EndDate, t.Numbers,
+        r.DrawDate, r.WinningNumbers, r.Matches, r.BonusHit, r.Multiplier, r.Prize
+        FROM {results_table} r JOIN {ticket_table} t ON r.TicketKey = t.TicketKey
+        WHERE r.DrawDate BETWEEN ? AND ?"""
+    params: List[object] = [start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")]
+    if ticket_id is not None:
+        sql += " AND r.TicketKey = ?"
+        params.append(ticket_id)
+    sql += " ORDER BY r.TicketKey, r.DrawDate"
+
+    tickets: Dict[int, LotteryTicket] = {}
+    all_results: List[Tuple[LotteryTicket, TicketResult]] = []
+    for row in conn.execute(sql, params).fetchall():
+        if row[0] not in tickets:
+            tickets[row[0]] = TicketLoader.load_ticket(
+                lotto_name=row[1],
+                start_date=row[2],
+                end_date=row[3],
+                numbers=[int(x) for x in row[4].split(" ")],
+                ticket_id=row[0],
+            )
+        result = TicketResult(
+            ticket_id=row[0],
+            drawing_date=arrow.get(row[5], "YYYYMMDD").format("YYYY-MM-DD"),
+            winning_numbers=[int(x) for x in row[6].split(" ")],
+            matches=row[7],
+            bonus_hit=bool(row[8]),
+            multiplier=row[9],
+            prize=row[10],
+        )
+        all_results.append((tickets[row[0]], result))
+    return all_results
+
+
+def query_unscored_schedule_pairs(
+    conn: sqlite3.Connection,
+    schedule_table: str,
+    ticket_table: str,
+    results_table: str,
+) -> List[Tuple[LotteryTicket, str]]:
+    """Get scheduled (ticket, drawing) pairs with no stored result, e.g. pairs
+    checked before the results table existed
+
+    Returns:
+        List[Tuple[LotteryTicket, str]]: tickets and "YYYYMMDD" drawing dates
+    """
+    #   TicketKey is stored as text in the schedule table
+    sql = f"""SELECT t.TicketKey, t.LottoName, t.StartDate, t.EndDate, t.Numbers,
+        s.ScheduleDate
+        FROM {schedule_table} s
+        JOIN {ticket_table} t ON CAST(s.TicketKey AS INTEGER) = t.TicketKey
+        LEFT JOIN {results_table} r
+            ON r.TicketKey = t.TicketKey AND r.DrawDate = s.ScheduleDate
+        WHERE r.TicketKey IS NULL
+        ORDER BY t.TicketKey, s.ScheduleDate"""
+    tickets: Dict[int, LotteryTicket] = {}
+    pairs: List[Tuple[LotteryTicket, str]] = []
+    for row in conn.execute(sql).fetchall():
+        if row[0] not in tickets:
+            tickets[row[0]] = TicketLoader.load_ticket(
+                lotto_name=row[1],
+                start_date=row[2],
+                end_date=row[3],
+                numbers=[int(x) for x in row[4].split(" ")],
+                ticket_id=row[0],
+            )
+        pairs.append((tickets[row[0]], row[5]))
+    return pairs
+
+
+def query_results_summary(
+    conn: sqlite3.Connection,
+    results_table: str,
+    ticket_table: str,
+    start_date: arrow.Arrow,
+    end_date: arrow.Arrow,
+) -> List[Tuple[str, int, int, int, int]]:
+    """Summarize stored results per game in date range
+
+    Returns:
+        List[Tuple[str, int, int, int, int]]: (lotto_name, drawings,
+            (ticket, drawing) pairs checked, winning pairs, total prize)
+    """
+    sql = f"""SELECT t.LottoName, COUNT(DISTINCT r.DrawDate), COUNT(*),
+        SUM(r.Prize > 0), SUM(r.Prize)
+        FROM {results_table} r JOIN {ticket_table} t ON r.TicketKey = t.TicketKey
+        WHERE r.DrawDate BETWEEN ? AND ?
+        GROUP BY t.LottoName ORDER BY t.LottoName"""
+    cursor = conn.execute(
+        sql, (start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d"))
+    )
+    return cursor.fetchall()
+
+
+def create_watermark_table(conn: sqlite3.Connection, watermark_table_name: str) -> None:
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {watermark_table_name} (
+            LottoName varchar(255) PRIMARY KEY,
+            DrawDate varchar(255)
+        );
+    """
+    conn.execute(sql)
+
+
+def query_watermark_table(
+    conn: sqlite3.Connection,
+    watermark_table: str,
+    lotto_name: str,
+) -> Optional[arrow.Arrow]:
+    """Get the last processed drawing date for a game, or None if never processed"""
+    sql = f"""SELECT DrawDate from {watermark_table} where LottoName=?"""
+    result = conn.execute(sql, (lotto_name,)).fetchone()
+    if result is None:
+        return None
+    return arrow.get(result[0], "YYYYMMDD")
+
+
+def update_watermark_table(
+    conn: sqlite3.Connection,
+    watermark_table: str,
+    lotto_name: str,
+    draw_date: arrow.Arrow,
+    expected: Optional[arrow.Arrow],
+) -> bool:
+    """Advance the watermark for a game, only if it still holds the value the
+    caller read before checking (None if there was no watermark).  A watermark
+    lowered or advanced in between, e.g. by add, is left in place.
+    Does not commit; callers group this with the schedule rows it covers
+
+    Returns:
+        bool: True if the watermark was advanced
+    """
+    sql = f"""INSERT INTO {watermark_table} (LottoName, DrawDate) VALUES (?, ?)
+        ON CONFLICT (LottoName) DO UPDATE SET DrawDate = excluded.DrawDate
+        WHERE {watermark_table}.DrawDate IS ?
+        AND excluded.DrawDate > {watermark_table}.DrawDate"""
+    cursor = conn.execute(
+        sql,
+        (
+            lotto_name,
+            draw_date.strftime("%Y%m%d"),
+            None if expected is None else expected.strftime("%Y%m%d"),
+        ),
+    )
+    return cursor.rowcount == 1
+
+
+def lower_watermark_table(
+    conn: sqlite3.Connection,
+    watermark_table: str,
+    lotto_name: str,
+    draw_date: arrow.Arrow,
+) -> None:
+    """Move the watermark for a game back to draw_date if it is later, or set it
+    if the game has none, e.g. for a new ticket starting on or before it.
+    Already-claimed pairs are not re-reported.
+    Does not commit; callers group this with the tickets it covers
+    """
+    sql = f"""INSERT INTO {watermark_table} (LottoName, DrawDate) VALUES (?, ?)
+        ON CONFLICT (LottoName) DO UPDATE SET DrawDate = excluded.DrawDate
+        WHERE excluded.DrawDate < {watermark_table}.DrawDate"""
+    conn.execute(sql, (lotto_name, draw_date.strftime("%Y%m%d")))
+
+
+def create_lease_table(conn: sqlite3.Connection, lease_table_name: str) -> None:
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {lease_table_name} (
+            LeaseName varchar(255) PRIMARY KEY,
+            Owner varchar(255),
+            ExpiresAt INTEGER
+        );
+    """
+    conn.execute(sql)
+
+
+def acquire_lease(
+    conn: sqlite3.Connection,
+    lease_table: str,
+    lease_name: str,
+    owner: str,
+    ttl_seconds: int,
+) -> bool:
+    """Take (or renew) a named lease; expired leases from stale runs are taken over
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection
+        lease_table (str): lease table name
+        lease_name (str): what is being locked, e.g. "check"
+        owner (str): unique id of the run taking the lease
+        ttl_seconds (int): seconds until the lease may be recovered by another run
+
+    Returns:
+        bool: True if this owner now holds the lease
+    """
+    now = arrow.utcnow().int_timestamp
+    with conn:
+        current = conn.execute(
+            f"""SELECT Owner, ExpiresAt from {lease_table} where LeaseName=?""",
+            (lease_name,),
+        ).fetchone()
+        cursor = conn.execute(
+            f"""INSERT INTO {lease_table} (LeaseName, Owner, ExpiresAt)
+            VALUES (?, ?, ?)
+            ON CONFLICT (LeaseName) DO UPDATE SET
+                Owner = excluded.Owner, ExpiresAt = excluded.ExpiresAt
+            WHERE {lease_table}.ExpiresAt < ? OR {lease_table}.Owner = excluded.Owner""",
+            (lease_name, owner, now + ttl_seconds, now),
+        )
+    acquired = cursor.rowcount == 1
+    if acquired and current is not None and current[0] != owner:
+        logger.warning(f"Recovered stale {lease_name} lease from {current[0]}")
+    return acquired
+
+
+def release_lease(
+    conn: sqlite3.Connection, lease_table: str, lease_name: str, owner: str
+) -> None:
+    """Release a lease if this owner still holds it"""
+    with conn:
+        conn.execute(
+            f"""DELETE FROM {lease_table} where LeaseName=? and Owner=?""",
+            (lease_name, owner),
+        )
+
+
+def query_ticket_key_range(
+    conn: sqlite3.Connection, ticket_table: str
+) -> Optional[Tuple[int, int]]:
+    """Get the smallest and largest TicketKey, or None if there are no tickets"""
+    first, last = conn.execute(
+        f"""SELECT MIN(TicketKey), MAX(TicketKey) from {ticket_table}"""
+    ).fetchone()
+    if first is None:
+        return None
+    return first, last
+
+
+def query_ticket_start_dates(
+    conn: sqlite3.Connection, ticket_table: str
+) -> Dict[str, arrow.Arrow]:
+    """Get the earliest ticket start date for every game in the ticket table"""
+    sql = f"""SELECT DISTINCT LottoName, StartDate from {ticket_table}"""
+    start_dates: Dict[str, arrow.Arrow] = {}
+    for lotto_name, start_date in conn.execute(sql).fetchall():
+        ticket_start = arrow.get(start_date)
+        if lotto_name not in start_dates or ticket_start < start_dates[lotto_name]:
+            start_dates[lotto_name] = ticket_start
+    return start_dates
 
 
 def check_table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
@@ -152,6 +610,34 @@ def check_table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
     return False
 
 
+def check_index_exists(conn: sqlite3.Connection, index_name: str) -> bool:
+    """Check to see if sqlite index exists"""
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' and name=?", (index_name,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _overlaps(
+    overlaps: Dict[Tuple[str, str], bool],
+    ticket_start: str,
+    ticket_end: str,
+    start_date: arrow.Arrow,
+    end_date: arrow.Arrow,
+) -> bool:
+    """Check whether a stored ticket's dates overlap [start_date, end_date]
+    Tickets share few distinct date ranges, so each range is parsed once and
+    its answer kept in overlaps
+    """
+    overlap = overlaps.get((ticket_start, ticket_end))
+    if overlap is None:
+        overlap = (
+            arrow.get(ticket_start) <= end_date and arrow.get(ticket_end) >= start_date
+        )
+        overlaps[(ticket_start, ticket_end)] = overlap
+    return overlap
+
+
 def _get_db_path() -> str:
     """Get JSON config"""
     return os.path.join(basedir(), "data", "db", "database.db")
@@ -1,34 +1,42 @@
 """
 lotto/drawings.py
 """
-from abc import ABC, abstractmethod
-from enum import Enum
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import arrow
 import requests
 
+from lotto.games import GameSpec, get_game
 
-class DrawingType(Enum):
-    MEGA_MILLIONS = "mega_millions"
-    POWERBALL = "powerball"
+#   Socrata returns 1000 rows unless asked for more
+SOCRATA_LIMIT = 50000
+#   Seconds to wait on Socrata, so a stalled fetch cannot hang a caller
+REQUEST_TIMEOUT = 30
 
 
-class LotteryDrawing(ABC):
+class LotteryDrawing:
     def __init__(
         self,
+        spec: GameSpec,
         start_date: str,
         end_date: str,
     ) -> None:
-        """Constructor for base class
+        """Constructor
 
         Args:
+            spec (GameSpec): game whose drawings to query
             start_date (str): start of drawings to query
             end_date (str): end of drawings to query
         """
         super().__init__()
+        self._spec = spec
         self._start_date = arrow.get(start_date)
         self._end_date = arrow.get(end_date)
+        self._multipliers: Dict[str, Optional[int]] = {}
+
+    @property
+    def spec(self) -> GameSpec:
+        return self._spec
 
     @property
     def start_date(self) -> arrow.Arrow:
@@ -38,74 +46,28 @@ class LotteryDrawing(ABC):
     def end_date(self) -> arrow.Arrow:
         return self._end_date
 
-    @abstractmethod
-    def get_drawings(self) -> Dict[str, List[int]]:
-        """Get a message containing hit information"""
-
-
-class MegaMillionsDrawing(LotteryDrawing):
-    """
-    Source: https://data.ny.gov/Government-Finance/
-        Lottery-Mega-Millions-Winning-Numbers-Beginning-20/5xaw-6ayf
-
-    [{"draw_date":"2022-11-22T00:00:00.000",
-        "winning_numbers":"13 23 24 25 43","mega_ball":"02",
-        "multiplier":"03"}, ...]
-    """
-
-    URL = "https://data.ny.gov/resource/5xaw-6ayf.json"
-
-    def __init__(
-        self,
-        start_date: str,
-        end_date: str,
-    ) -> None:
-        super(MegaMillionsDrawing, self).__init__(start_date, end_date)
-
-    def get_drawings(self) -> Dict[str, List[int]]:
-        response = requests.get(MegaMillionsDrawing.URL)
-        drawings = response.json()
-        relevant_drawings = {}
-        for drawing in drawings:
-            draw_date = drawing["draw_date"][:10]
-            if not self.start_date <= arrow.get(draw_date) <= self.end_date:
-                continue
-            relevant_drawings[draw_date] = [
-                int(x) for x in drawing["winning_numbers"].split(" ")
-            ] + [int(drawing["mega_ball"])]
-        return relevant_drawings
-
-
-class PowerballDrawing(LotteryDrawing):
-    """
-    Source: https://data.ny.gov/Government-Finance/
-        Lottery-Powerball-Winning-Numbers-Beginning-2010/d6yy-54nr
-
-    [{"draw_date":"2022-11-21T00:00:00.000",
-    "winning_numbers":"01 06 40 51 67 02","multiplier":"2"} ...]
-    """
-
-    URL = "https://data.ny.gov/resource/d6yy-54nr.json"
-
-    def __init__(
-        self,
-        start_date: str,
-        end_date: str,
-    ) -> None:
-        super(PowerballDrawing, self).__init__(start_date, end_date)
+    @property
+    def multipliers(self) -> Dict[str, Optional[int]]:
+        """Multiplier drawn on each date, populated by get_drawings"""
+        return self._multipliers
 
     def get_drawings(self) -> Dict[str, List[int]]:
-        response = requests.get(PowerballDrawing.URL)
-        drawings = response.json()
-        relevant_drawings = {}
-        for drawing in drawings:
-            draw_date = drawing["draw_date"][:10]
-            if not self.start_date <= arrow.get(draw_date) <= self.end_date:
-                continue
-            relevant_drawings[draw_date] = [
-                int(x) for x in drawing["winning_numbers"].split(" ")
-            ]
-        return relevant_drawings
+        """Get {"2022-11-21": [3, 5, 22, 45, 56, 3]} for drawings in date range"""
+        start_key = self.start_date.format("YYYY-MM-DD")
+        end_key = self.end_date.format("YYYY-MM-DD")
+        response = requests.get(
+            self._spec.url,
+            params={
+                "$where": f"{self._spec.date_field} between "
+                f"'{start_key}T00:00:00' and '{end_key}T23:59:59'",
+                "$limit": str(SOCRATA_LIMIT),
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        drawings, self._multipliers = parse_drawings(
+            self._spec, response.json(), start_key, end_key
+        )
+        return drawings
 
 
 class DrawingLoader:
@@ -115,12 +77,40 @@ class DrawingLoader:
         start_date: str,
         end_date: str,
     ) -> LotteryDrawing:
-
-        if DrawingType(lotto_name) == DrawingType.MEGA_MILLIONS:
-            return MegaMillionsDrawing(start_date, end_date)
-        elif DrawingType(lotto_name) == DrawingType.POWERBALL:
-            return PowerballDrawing(
-                start_date,
-                end_date,
-            )
-        raise ValueError(f"Unknown lotto_name {lotto_name}")
+        return LotteryDrawing(get_game(lotto_name), start_date, end_date)
+
+
+def parse_drawings(
+    spec: GameSpec,
+    rows: List[Dict[str, Any]],
+    start_key: str,
+    end_key: str,
+) -> Tuple[Dict[str, List[int]], Dict[str, Optional[int]]]:
+    """Parse Socrata rows for any game into drawings and multipliers
+
+    Args:
+        spec (GameSpec): field layout of the rows
+        rows (List[Dict[str, Any]]): [{"draw_date":"2022-11-21T00:00:00.000", ...}]
+        start_key (str): first drawing date kept, YYYY-MM-DD
+        end_key (str): last drawing date kept, YYYY-MM-DD
+
+    Returns:
+        Tuple[Dict[str, List[int]], Dict[str, Optional[int]]]: numbers (bonus last)
+            and multiplier, keyed by drawing date
+    """
+    date_field, numbers_field = spec.date_field, spec.numbers_field
+    bonus_field, multiplier_field = spec.bonus_field, spec.multiplier_field
+    drawings: Dict[str, List[int]] = {}
+    multipliers: Dict[str, Optional[int]] = {}
+    for row in rows:
+        #   ISO dates compare correctly as strings, no parsing needed
+        draw_date = row[date_field][:10]
+        if not start_key <= draw_date <= end_key:
+            continue
+        numbers = list(map(int, row[numbers_field].split()))
+        if bonus_field is not None:
+            numbers.append(int(row[bonus_field]))
+        drawings[draw_date] = numbers
+        multiplier = row.get(multiplier_field) if multiplier_field else None
+        multipliers[draw_date] = int(multiplier) if multiplier else None
+    return drawings, multipliers
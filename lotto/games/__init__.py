@@ -0,0 +1,140 @@
+"""
+lotto/games/__init__.py
+
+Game specs and a lazily loaded registry of them.
+
+A game is declared as a GameSpec (dataset, field layout, number ranges, bonus
+and prize rules) in its own module, and registered under the "lotto.games"
+entry point group, e.g. in another package's setup.py:
+
+    entry_points={"lotto.games": ["take5 = lotto_take5:SPEC"]}
+
+Games shipped with lotto are listed once, in BUILTIN_GAMES; setup.py builds
+lotto's own entry points from it.  Built-in games always win: an installed
+entry point with the same name as a built-in game is ignored.
+
+Spec modules are only imported the first time their game is looked up.
+"""
+import importlib
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+ENTRY_POINT_GROUP = "lotto.games"
+SOCRATA_URL = "https://data.ny.gov/resource/{dataset_id}.json"
+
+#   Games shipped with lotto, loadable without the package being installed
+BUILTIN_GAMES: Dict[str, str] = {
+    "cash4life": "lotto.games.cash4life:SPEC",
+    "mega_millions": "lotto.games.mega_millions:SPEC",
+    "powerball": "lotto.games.powerball:SPEC",
+}
+
+
+class GameSpec(NamedTuple):
+    """Everything needed to fetch, parse and score one game
+
+    Tickets and drawings are [main numbers..., bonus].  The bonus is read from
+    bonus_field, or is the last of numbers_field when bonus_field is None.
+    prizes / bonus_prizes are indexed by main-number matches, without / with
+    the bonus ball.
+    """
+
+    name: str
+    display_name: str
+    bonus_name: str
+    dataset_id: str
+    numbers_field: str
+    bonus_field: Optional[str]
+    multiplier_field: Optional[str]
+    main_count: int
+    main_max: int
+    bonus_max: int
+    prizes: Tuple[int, ...]
+    bonus_prizes: Tuple[int, ...]
+    date_field: str = "draw_date"
+
+    @property
+    def url(self) -> str:
+        return SOCRATA_URL.format(dataset_id=self.dataset_id)
+
+
+class GameRegistry:
+    def __init__(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Constructor
+
+        Args:
+            group (str, optional): entry point group declaring GameSpecs
+        """
+        self._group = group
+        self._specs: Dict[str, GameSpec] = {}
+        self._loaders: Optional[Dict[str, Callable[[], GameSpec]]] = None
+
+    def get(self, name: str) -> GameSpec:
+        """Get a game's spec, loading it on first use"""
+        spec = self._specs.get(name)
+        if spec is None:
+            spec = self._load(name)
+        return spec
+
+    def names(self) -> List[str]:
+        """Names of every available game; does not load their specs"""
+        return sorted(self._discover().keys())
+
+    def register(self, spec: GameSpec) -> None:
+        """Add a spec directly, without an entry point"""
+        self._specs[spec.name] = spec
+
+    def _discover(self) -> Dict[str, Callable[[], GameSpec]]:
+        """Collect loaders for builtin and entry point games (scanned once)"""
+        if self._loaders is None:
+            loaders: Dict[str, Callable[[], GameSpec]] = {
+                name: _object_loader(path) for name, path in BUILTIN_GAMES.items()
+            }
+            for entry_point in entry_points(group=self._group):
+                loaders.setdefault(entry_point.name, entry_point.load)
+            self._loaders = loaders
+        return self._loaders
+
+    def _load(self, name: str) -> GameSpec:
+        #   Builtin games win over entry points, so skip scanning installed packages
+        if name in BUILTIN_GAMES and self._loaders is None:
+            loader: Optional[Callable[[], GameSpec]] = _object_loader(
+                BUILTIN_GAMES[name]
+            )
+        else:
+            loader = self._discover().get(name)
+        if loader is None:
+            raise ValueError(f"Unknown lotto_name {name}")
+        spec = loader()
+        if not isinstance(spec, GameSpec) or spec.name != name:
+            raise ValueError(f"Entry point {name} is not a GameSpec named {name}")
+        self._specs[name] = spec
+        return spec
+
+
+_registry = GameRegistry()
+
+
+def get_game(name: str) -> GameSpec:
+    """Get a game's spec from the default registry"""
+    return _registry.get(name)
+
+
+def game_names() -> List[str]:
+    """Names of every game in the default registry"""
+    return _registry.names()
+
+
+def register_game(spec: GameSpec) -> None:
+    """Add a spec to the default registry"""
+    _registry.register(spec)
+
+
+def _object_loader(path: str) -> Callable[[], GameSpec]:
+    """Loader for a "package.module:ATTRIBUTE" path"""
+    module_name, attribute = path.split(":")
+
+    def load() -> GameSpec:
+        return getattr(importlib.import_module(module_name), attribute)
+
+    return load
@@ -0,0 +1,27 @@
+"""
+lotto/games/cash4life.py
+
+Source: https://data.ny.gov/Government-Finance/
+    Lottery-Cash-4-Life-Winning-Numbers-Beginning-2014/kwav-7ju8
+
+[{"draw_date":"2022-11-21T00:00:00.000",
+"winning_numbers":"05 10 17 43 56","cash_ball":"01"} ...]
+
+Top two prizes are annuities; their one-time cash option is used.
+"""
+from lotto.games import GameSpec
+
+SPEC = GameSpec(
+    name="cash4life",
+    display_name="Cash4Life",
+    bonus_name="cashball",
+    dataset_id="kwav-7ju8",
+    numbers_field="winning_numbers",
+    bonus_field="cash_ball",
+    multiplier_field=None,
+    main_count=5,
+    main_max=60,
+    bonus_max=4,
+    prizes=(0, 0, 4, 25, 500, 1000000),
+    bonus_prizes=(0, 2, 10, 100, 2500, 7000000),
+)
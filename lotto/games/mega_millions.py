@@ -0,0 +1,26 @@
+"""
+lotto/games/mega_millions.py
+
+Source: https://data.ny.gov/Government-Finance/
+    Lottery-Mega-Millions-Winning-Numbers-Beginning-20/5xaw-6ayf
+
+[{"draw_date":"2022-11-22T00:00:00.000",
+    "winning_numbers":"13 23 24 25 43","mega_ball":"02",
+    "multiplier":"03"}, ...]
+"""
+from lotto.games import GameSpec
+
+SPEC = GameSpec(
+    name="mega_millions",
+    display_name="MegaMillions",
+    bonus_name="megaball",
+    dataset_id="5xaw-6ayf",
+    numbers_field="winning_numbers",
+    bonus_field="mega_ball",
+    multiplier_field="multiplier",
+    main_count=5,
+    main_max=70,
+    bonus_max=24,
+    prizes=(0, 0, 0, 10, 500, 1000000),
+    bonus_prizes=(2, 4, 10, 200, 10000, 1000000),
+)
@@ -0,0 +1,25 @@
+"""
+lotto/games/powerball.py
+
+Source: https://data.ny.gov/Government-Finance/
+    Lottery-Powerball-Winning-Numbers-Beginning-2010/d6yy-54nr
+
+[{"draw_date":"2022-11-21T00:00:00.000",
+"winning_numbers":"01 06 40 51 67 02","multiplier":"2"} ...]
+"""
+from lotto.games import GameSpec
+
+SPEC = GameSpec(
+    name="powerball",
+    display_name="Powerball",
+    bonus_name="powerball",
+    dataset_id="d6yy-54nr",
+    numbers_field="winning_numbers",
+    bonus_field=None,
+    multiplier_field="multiplier",
+    main_count=5,
+    main_max=69,
+    bonus_max=26,
+    prizes=(0, 0, 0, 7, 100, 1000000),
+    bonus_prizes=(4, 4, 7, 100, 50000, 1000000),
+)
@@ -0,0 +1,135 @@
+"""
+lotto/generate/__init__.py
+
+Ticket set generation: unique quick picks, and wheels (covering designs) that
+guarantee a t-match on some ticket whenever t drawn main numbers are in the
+wheeled set.  Tickets are tuples of sorted main numbers followed by the bonus.
+"""
+import heapq
+import logging
+import random
+from itertools import combinations
+from math import comb
+from typing import Iterable, List, Optional, Set, Tuple
+
+from lotto import loggername
+
+logger = logging.getLogger(loggername())
+
+Ticket = Tuple[int, ...]
+MAX_WHEEL_BLOCKS = 200_000
+
+
+def canonical_ticket(numbers: Iterable[int]) -> Ticket:
+    """Sort the main numbers so equal picks compare equal; bonus stays last"""
+    *main_numbers, bonus = numbers
+    main_numbers.sort()
+    return (*main_numbers, bonus)
+
+
+def quick_picks(
+    count: int,
+    main_count: int,
+    main_max: int,
+    bonus_max: int,
+    exclude: Optional[Set[Ticket]] = None,
+    rng: Optional[random.Random] = None,
+) -> List[Ticket]:
+    """Generate unique random tickets
+
+    Args:
+        count (int): tickets to generate
+        main_count (int): main numbers per ticket
+        main_max (int): main numbers are drawn from 1..main_max without replacement
+        bonus_max (int): bonus ball is drawn from 1..bonus_max
+        exclude (Set[Ticket], optional): canonical tickets that must not be generated
+        rng (random.Random, optional): random source, e.g. seeded for repeatability
+
+    Returns:
+        List[Ticket]: canonical tickets
+    """
+    rng = rng or random.Random()
+    seen = set() if exclude is None else set(exclude)
+    if count > comb(main_max, main_count) * bonus_max - len(seen):
+        raise ValueError(f"Cannot generate {count} unique tickets")
+
+    population = range(1, main_max + 1)
+    sample, randint = rng.sample, rng.randint
+    tickets: List[Ticket] = []
+    while len(tickets) < count:
+        ticket = tuple(sorted(sample(population, main_count))) + (
+            randint(1, bonus_max),
+        )
+        if ticket not in seen:
+            seen.add(ticket)
+            tickets.append(ticket)
+    return tickets
+
+
+def wheel(
+    numbers: List[int],
+    main_count: int,
+    guarantee: int,
+    bonus: Optional[int],
+    bonus_max: int,
+    rng: Optional[random.Random] = None,
+) -> List[Ticket]:
+    """Cover every guarantee-sized subset of numbers with as few tickets as
+    practical, using a lazy greedy search over all main_count-subsets
+
+    Args:
+        numbers (List[int]): main numbers to wheel
+        main_count (int): main numbers per ticket
+        guarantee (int): match size guaranteed when that many drawn numbers
+            are in numbers
+        bonus (int, optional): bonus ball for every ticket; random if None
+        bonus_max (int): bonus ball is drawn from 1..bonus_max
+        rng (random.Random, optional): random source for bonus balls
+
+    Returns:
+        List[Ticket]: canonical tickets
+    """
+    rng = rng or random.Random()
+    pool = sorted(set(numbers))
+    if not 1 <= guarantee <= main_count <= len(pool):
+        raise ValueError(
+            f"Need 1 <= guarantee ({guarantee}) <= {main_count} <= "
+            f"wheeled numbers ({len(pool)})"
+        )
+    if comb(len(pool), main_count) > MAX_WHEEL_BLOCKS:
+        raise ValueError(f"Too many numbers to wheel: {len(pool)}")
+
+    #   Each guarantee-subset of pool positions gets one bit
+    subset_bits = {
+        subset: 1 << i
+        for i, subset in enumerate(combinations(range(len(pool)), guarantee))
+    }
+    blocks = list(combinations(range(len(pool)), main_count))
+    block_masks = []
+    for block in blocks:
+        mask = 0
+        for subset in combinations(block, guarantee):
+            mask |= subset_bits[subset]
+        block_masks.append(mask)
+
+    #   Coverage gain only shrinks as blocks are chosen, so a stale heap entry
+    #   is an upper bound: re-score the top entry and keep it if still the best
+    uncovered = (1 << len(subset_bits)) - 1
+    per_block = comb(main_count, guarantee)
+    heap = [(-per_block, i) for i in range(len(blocks))]
+    chosen: List[int] = []
+    while uncovered:
+        _, i = heapq.heappop(heap)
+        gain = (block_masks[i] & uncovered).bit_count()
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        chosen.append(i)
+        uncovered &= ~block_masks[i]
+    logger.debug(f"Wheel of {len(pool)} numbers needs {len(chosen)} tickets")
+
+    return [
+        tuple(pool[position] for position in blocks[i])
+        + (bonus if bonus is not None else rng.randint(1, bonus_max),)
+        for i in chosen
+    ]
@@ -0,0 +1,280 @@
+"""
+lotto/server/__init__.py
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import arrow
+
+from lotto import loggername
+from lotto.db import query_results_table, query_ticket
+from lotto.drawings import DrawingLoader
+from lotto.games import game_names
+from lotto.tickets import TicketLoader, TicketResult
+
+logger = logging.getLogger(loggername())
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class DrawingCache:
+    """In-memory drawings for every game, refreshed in the background"""
+
+    def __init__(self, history_days: int, refresh_seconds: int) -> None:
+        """Constructor
+
+        Args:
+            history_days (int): days of drawing history to keep
+            refresh_seconds (int): seconds between background refreshes
+        """
+        self._history_days = history_days
+        self._refresh_seconds = refresh_seconds
+        #   {"powerball": {"2022-11-21": ([3, 5, 22, 45, 56, 3], 2)}}
+        self._drawings: Dict[str, Dict[str, Tuple[List[int], Optional[int]]]] = {}
+
+    def drawings(self, lotto_name: str) -> Dict[str, Tuple[List[int], Optional[int]]]:
+        """Cached {drawing_date: (winning_numbers, multiplier)} for a game"""
+        if lotto_name not in self._drawings:
+            raise HTTPError(400, f"Unknown lotto_name {lotto_name}")
+        return self._drawings[lotto_name]
+
+    async def refresh(self) -> None:
+        """Fetch every game's drawings; keep the old copy if a fetch fails"""
+        loop = asyncio.get_running_loop()
+        for lotto_name in game_names():
+            try:
+                self._drawings[lotto_name] = await loop.run_in_executor(
+                    None, self._fetch, lotto_name
+                )
+            except Exception:
+                logger.exception(f"Failed to refresh {lotto_name} drawings")
+                self._drawings.setdefault(lotto_name, {})
+
+    async def refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_seconds)
+            await self.refresh()
+
+    def _fetch(self, lotto_name: str) -> Dict[str, Tuple[List[int], Optional[int]]]:
+        end_date = arrow.utcnow()
+        start_date = end_date.shift(days=-self._history_days)
+        drawing_class = DrawingLoader.load_drawing(
+            lotto_name, start_date.format("YYYY-MM-DD"), end_date.format("YYYY-MM-DD")
+        )
+        drawings = drawing_class.get_drawings()
+        logger.debug(f"Cached {len(drawings)} {lotto_name} drawings")
+        return {
+            drawing_date: (
+                drawings[drawing_date],
+                drawing_class.multipliers.get(drawing_date),
+            )
+            for drawing_date in sorted(drawings.keys())
+        }
+
+
+class LottoServer:
+    """Asyncio HTTP server answering "did this ticket win?"
+
+    GET  /check?lotto_name=powerball&numbers=1,6,40,3,4,2[&start_date=..&end_date=..]
+    POST /check  {"tickets": [{"lotto_name": .., "numbers": [..], "start_date": ..}]}
+    GET  /tickets/<ticket_id>/results[?start_date=..&end_date=..]
+
+    Ad-hoc checks without dates are scored against the latest cached drawing.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        ticket_table: str,
+        results_table: str,
+        cache: DrawingCache,
+    ) -> None:
+        self._conn = conn
+        self._ticket_table = ticket_table
+        self._results_table = results_table
+        self._cache = cache
+
+    async def serve(self, host: str, port: int) -> None:
+        """Fill the drawing cache, then serve until cancelled"""
+        await self._cache.refresh()
+        refresh_task = asyncio.create_task(self._cache.refresh_forever())
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        logger.info(f"Serving on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresh_task.cancel()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests on one connection (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split(" ", 2)
+                headers = await _read_headers(reader)
+                length = int(headers.get("content-length", "0"))
+                if length > MAX_BODY_BYTES:
+                    raise HTTPError(400, "Request body too large")
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = self._dispatch(method, target, body)
+                keep_alive = (
+                    version.strip() == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as e:
+            _write_response(writer, e.status, {"error": str(e)}, False)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            if parts == ["check"] and method == "GET":
+                return 200, self._check(query)
+            if parts == ["check"] and method == "POST":
+                return 200, self._batch_check(body)
+            if (
+                len(parts) == 3
+                and parts[0] == "tickets"
+                and parts[2] == "results"
+                and method == "GET"
+            ):
+                return 200, self._ticket_results(parts[1], query)
+            raise HTTPError(404, f"No route for {method} {url.path}")
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            logger.exception(f"Error serving {method} {target}")
+            return 500, {"error": str(e)}
+
+    def _check(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        numbers = [int(x) for x in query["numbers"].split(",")]
+        return self._evaluate(
+            query["lotto_name"], numbers, query.get("start_date"), query.get("end_date")
+        )
+
+    def _batch_check(self, body: bytes) -> List[Dict[str, Any]]:
+        tickets = json.loads(body)["tickets"]
+        return [
+            {
+                "ticket": ticket,
+                "results": self._evaluate(
+                    ticket["lotto_name"],
+                    [int(x) for x in ticket["numbers"]],
+                    ticket.get("start_date"),
+                    ticket.get("end_date"),
+                ),
+            }
+            for ticket in tickets
+        ]
+
+    def _ticket_results(
+        self, ticket_id: str, query: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        if query_ticket(self._conn, self._ticket_table, int(ticket_id)) is None:
+            raise HTTPError(404, f"No ticket {ticket_id}")
+        start_date = arrow.get(query.get("start_date", "1970-01-01"))
+        end_date = (
+            arrow.get(query["end_date"]) if "end_date" in query else arrow.utcnow()
+        )
+        results = query_results_table(
+            self._conn,
+            self._results_table,
+            self._ticket_table,
+            start_date,
+            end_date,
+            int(ticket_id),
+        )
+        return [_result_json(result) for _, result in results]
+
+    def _evaluate(
+        self,
+        lotto_name: str,
+        numbers: List[int],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Score numbers against cached drawings between start_date and end_date"""
+        drawings = self._cache.drawings(lotto_name)
+        #   An empty cache still validates the ticket, then finds no drawings
+        drawing_dates = list(drawings.keys()) or [_date_key(arrow.utcnow())]
+        if start_date is None and end_date is None:
+            start_date = end_date = drawing_dates[-1]
+        start = drawing_dates[0] if start_date is None else _date_key(start_date)
+        end = drawing_dates[-1] if end_date is None else _date_key(end_date)
+
+        ticket = TicketLoader.load_ticket(lotto_name, start, end, numbers)
+        ticket.validate_numbers()
+        results = []
+        for drawing_date, (winning_numbers, multiplier) in drawings.items():
+            if start <= drawing_date <= end:
+                results.append(
+                    _result_json(
+                        ticket.evaluate(drawing_date, winning_numbers, multiplier)
+                    )
+                )
+        return results
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool
+) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def _date_key(date: Union[str, arrow.Arrow]) -> str:
+    """Normalize a date to the YYYY-MM-DD keys used by the drawing cache"""
+    return arrow.get(date).format("YYYY-MM-DD")
+
+
+def _result_json(result: TicketResult) -> Dict[str, Any]:
+    return result._asdict()
@@ -0,0 +1,277 @@
+"""
+lotto/stats/__init__.py
+
+Number-frequency aggregates over drawing history, updated incrementally.
+Tables share a prefix, e.g. "Stats":
+    StatsDraws   : drawings already counted, with a per-game draw index
+    StatsNumbers : per-number count and last-seen drawing
+    StatsGaps    : histogram of draws between consecutive appearances of a number
+    StatsPairs   : co-occurrence counts of main-number pairs
+Numbers are split into pools: "main", and "bonus" (the last drawn number).
+Number queries cover the game's current ranges, so numbers retired by rule
+changes drop out and numbers never drawn still appear.
+"""
+import logging
+import sqlite3
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import arrow
+
+from lotto import loggername
+from lotto.games import get_game
+
+logger = logging.getLogger(loggername())
+
+MAIN_POOL = "main"
+BONUS_POOL = "bonus"
+
+
+def create_stats_tables(conn: sqlite3.Connection, table_prefix: str) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table_prefix}Draws (
+            LottoName varchar(255),
+            DrawDate varchar(255),
+            DrawIndex INTEGER,
+            PRIMARY KEY (LottoName, DrawDate)
+        );
+    """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table_prefix}Numbers (
+            LottoName varchar(255),
+            Pool varchar(255),
+            Number INTEGER,
+            Count INTEGER,
+            LastSeenDate varchar(255),
+            LastSeenIndex INTEGER,
+            PRIMARY KEY (LottoName, Pool, Number)
+        );
+    """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table_prefix}Gaps (
+            LottoName varchar(255),
+            Pool varchar(255),
+            Gap INTEGER,
+            Count INTEGER,
+            PRIMARY KEY (LottoName, Pool, Gap)
+        );
+    """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table_prefix}Pairs (
+            LottoName varchar(255),
+            NumberA INTEGER,
+            NumberB INTEGER,
+            Count INTEGER,
+            PRIMARY KEY (LottoName, NumberA, NumberB)
+        );
+    """
+    )
+
+
+def query_last_stats_draw(
+    conn: sqlite3.Connection, table_prefix: str, lotto_name: str
+) -> Tuple[Optional[arrow.Arrow], int]:
+    """Get the latest counted drawing date (None if none) and its draw index"""
+    sql = f"""SELECT MAX(DrawDate), COALESCE(MAX(DrawIndex), 0)
+        from {table_prefix}Draws where LottoName=?"""
+    last_date, last_index = conn.execute(sql, (lotto_name,)).fetchone()
+    if last_date is None:
+        return None, 0
+    return arrow.get(last_date, "YYYYMMDD"), last_index
+
+
+def update_stats_tables(
+    conn: sqlite3.Connection,
+    table_prefix: str,
+    lotto_name: str,
+    drawings: Dict[str, List[int]],
+) -> int:
+    """Fold drawings newer than the last counted drawing into the aggregates
+    Older drawings are ignored, so the same drawings can be passed repeatedly
+
+    Args:
+        conn (sqlite3.Connection): sqlite connection
+        table_prefix (str): prefix of the stats tables
+        lotto_name (str): [mega_millions|powerball|etc]
+        drawings (Dict[str, List[int]]): {"2022-11-21": [3, 5, 22, 45, 56, 3]}
+
+    Returns:
+        int: number of drawings added
+    """
+    last_date, draw_index = query_last_stats_draw(conn, table_prefix, lotto_name)
+    last_key = "" if last_date is None else last_date.strftime("%Y%m%d")
+    new_draws = sorted(
+        (drawing_date.replace("-", ""), winning_numbers)
+        for drawing_date, winning_numbers in drawings.items()
+        if drawing_date.replace("-", "") > last_key
+    )
+    if len(new_draws) == 0:
+        return 0
+
+    #   Last appearance of each number so far, to measure gaps
+    last_seen: Dict[Tuple[str, int], int] = {
+        (pool, number): last_seen_index
+        for pool, number, last_seen_index in conn.execute(
+            f"""SELECT Pool, Number, LastSeenIndex from {table_prefix}Numbers
+            where LottoName=?""",
+            (lotto_name,),
+        )
+    }
+    counts: Counter = Counter()
+    gaps: Counter = Counter()
+    pairs: Counter = Counter()
+    last_seen_dates: Dict[Tuple[str, int], str] = {}
+    draw_rows = []
+    for draw_date, winning_numbers in new_draws:
+        draw_index += 1
+        draw_rows.append((lotto_name, draw_date, draw_index))
+        main_numbers = sorted(set(winning_numbers[:-1]))
+        for pool, numbers in (
+            (MAIN_POOL, main_numbers),
+            (BONUS_POOL, winning_numbers[-1:]),
+        ):
+            for number in numbers:
+                if (pool, number) in last_seen:
+                    gaps[(pool, draw_index - last_seen[(pool, number)])] += 1
+                last_seen[(pool, number)] = draw_index
+                last_seen_dates[(pool, number)] = draw_date
+                counts[(pool, number)] += 1
+        pairs.update(combinations(main_numbers, 2))
+
+    with conn:
+        conn.executemany(
+            f"""INSERT INTO {table_prefix}Draws (LottoName, DrawDate, DrawIndex)
+            VALUES (?, ?, ?)""",
+            draw_rows,
+        )
+        conn.executemany(
+            f"""INSERT INTO {table_prefix}Numbers
+            (LottoName, Pool, Number, Count, LastSeenDate, LastSeenIndex)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (LottoName, Pool, Number) DO UPDATE SET
+                Count = Count + excluded.Count,
+                LastSeenDate = excluded.LastSeenDate,
+                LastSeenIndex = excluded.LastSeenIndex""",
+            [
+                (
+                    lotto_name,
+                    pool,
+                    number,
+                    count,
+                    last_seen_dates[(pool, number)],
+                    last_seen[(pool, number)],
+                )
+                for (pool, number), count in counts.items()
+            ],
+        )
+        conn.executemany(
+            f"""INSERT INTO {table_prefix}Gaps (LottoName, Pool, Gap, Count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (LottoName, Pool, Gap) DO UPDATE SET
+                Count = Count + excluded.Count""",
+            [(lotto_name, pool, gap, count) for (pool, gap), count in gaps.items()],
+        )
+        conn.executemany(
+            f"""INSERT INTO {table_prefix}Pairs (LottoName, NumberA, NumberB, Count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (LottoName, NumberA, NumberB) DO UPDATE SET
+                Count = Count + excluded.Count""",
+            [(lotto_name, a, b, count) for (a, b), count in pairs.items()],
+        )
+    logger.debug(f"Counted {len(draw_rows)} new {lotto_name} drawings")
+    return len(draw_rows)
+
+
+def query_number_counts(
+    conn: sqlite3.Connection,
+    table_prefix: str,
+    lotto_name: str,
+    pool: str,
+    limit: int,
+    hottest: bool = True,
+) -> List[Tuple[int, int]]:
+    """Get the most (or least) frequently drawn numbers that can still be drawn
+    Numbers in the game's current range that were never drawn count as 0
+
+    Returns:
+        List[Tuple[int, int]]: (number, count)
+    """
+    sql = f"""SELECT Number, Count from {table_prefix}Numbers
+        where LottoName=? and Pool=? and Number BETWEEN 1 AND ?"""
+    max_number = _max_number(lotto_name, pool)
+    counts = dict(conn.execute(sql, (lotto_name, pool, max_number)).fetchall())
+    numbers = [(number, counts.get(number, 0)) for number in range(1, max_number + 1)]
+    numbers.sort(key=lambda row: (-row[1] if hottest else row[1], row[0]))
+    return numbers[:limit]
+
+
+def query_overdue_numbers(
+    conn: sqlite3.Connection,
+    table_prefix: str,
+    lotto_name: str,
+    pool: str,
+    limit: int,
+) -> List[Tuple[int, int, Optional[str]]]:
+    """Get the numbers that can still be drawn with the most drawings since they
+    last appeared; numbers never drawn come first, with no last seen date
+
+    Returns:
+        List[Tuple[int, int, Optional[str]]]: (number, drawings since seen,
+            last seen date)
+    """
+    _, draw_index = query_last_stats_draw(conn, table_prefix, lotto_name)
+    sql = f"""SELECT Number, LastSeenIndex, LastSeenDate from {table_prefix}Numbers
+        where LottoName=? and Pool=? and Number BETWEEN 1 AND ?"""
+    max_number = _max_number(lotto_name, pool)
+    last_seen = {
+        number: (last_seen_index, last_seen_date)
+        for number, last_seen_index, last_seen_date in conn.execute(
+            sql, (lotto_name, pool, max_number)
+        )
+    }
+    numbers: List[Tuple[int, int, Optional[str]]] = []
+    for number in range(1, max_number + 1):
+        last_seen_index, last_seen_date = last_seen.get(number, (0, None))
+        numbers.append((number, draw_index - last_seen_index, last_seen_date))
+    numbers.sort(key=lambda row: (-row[1], row[0]))
+    return numbers[:limit]
+
+
+def query_gap_histogram(
+    conn: sqlite3.Connection, table_prefix: str, lotto_name: str, pool: str
+) -> List[Tuple[int, int]]:
+    """Get how often a number reappeared after each gap length
+
+    Returns:
+        List[Tuple[int, int]]: (gap in drawings, count), ordered by gap
+    """
+    sql = f"""SELECT Gap, Count from {table_prefix}Gaps
+        where LottoName=? and Pool=? ORDER BY Gap"""
+    return conn.execute(sql, (lotto_name, pool)).fetchall()
+
+
+def query_pair_counts(
+    conn: sqlite3.Connection, table_prefix: str, lotto_name: str, limit: int
+) -> List[Tuple[int, int, int]]:
+    """Get the main-number pairs drawn together most often
+
+    Returns:
+        List[Tuple[int, int, int]]: (number_a, number_b, count)
+    """
+    sql = f"""SELECT NumberA, NumberB, Count from {table_prefix}Pairs
+        where LottoName=? ORDER BY Count DESC, NumberA, NumberB LIMIT ?"""
+    return conn.execute(sql, (lotto_name, limit)).fetchall()
+
+
+def _max_number(lotto_name: str, pool: str) -> int:
+    """Largest number the game's current rules can draw in a pool"""
+    spec = get_game(lotto_name)
+    return spec.main_max if pool == MAIN_POOL else spec.bonus_max
@@ -1,39 +1,59 @@
 """
 lotto/tickets.py
 """
-from abc import ABC, abstractmethod
-from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
 
 import arrow
 
+from lotto.games import GameSpec, get_game
 
-class LottoType(Enum):
-    MEGA_MILLIONS = "mega_millions"
-    POWERBALL = "powerball"
 
+class TicketResult(NamedTuple):
+    """Outcome of one ticket against one drawing"""
 
-class LotteryTicket(ABC):
+    ticket_id: Optional[int]
+    drawing_date: str
+    winning_numbers: List[int]
+    matches: int
+    bonus_hit: bool
+    multiplier: Optional[int]
+    prize: int
+
+
+class LotteryTicket:
     def __init__(
         self,
+        spec: GameSpec,
         start_date: str,
         end_date: str,
         numbers: List[int],
         ticket_id: Optional[int] = None,
     ) -> None:
-        """Constructor for base class
+        """Constructor
 
         Args:
+            spec (GameSpec): rules of the game this ticket is for
             start_date (str): start of ticket
             end_date (str): end of ticket
-            numbers (List[int]): Lottery numbers
+            numbers (List[int]): Lottery numbers, bonus last
             ticket_id (int, optional): id in database
         """
         super().__init__()
-        self._start_date = arrow.get(start_date)
-        self._end_date = arrow.get(end_date)
+        self._spec = spec
+        self._start_date = _get_date(start_date)
+        self._end_date = _get_date(end_date)
         self._numbers = numbers
         self._ticket_id = ticket_id
+        assert len(self._numbers), f"Expected {spec.main_count + 1}, got 0"
+
+    @property
+    def spec(self) -> GameSpec:
+        return self._spec
+
+    @property
+    def lotto_name(self) -> str:
+        return self._spec.name
 
     @property
     def start_date(self) -> arrow.Arrow:
@@ -51,91 +71,52 @@ class LotteryTicket(ABC):
     def ticket_id(self) -> Optional[int]:
         return self._ticket_id
 
-    @abstractmethod
-    def check_winnings(self, drawing_date: str, winning_numbers: List[int]) -> str:
-        """Get a message containing winnings information"""
-
-    @property
-    @abstractmethod
-    def lotto_type(self) -> LottoType:
-        raise NotImplementedError()
-
-
-class MegaMillionsTicket(LotteryTicket):
-    LOTTO_TYPE = LottoType.MEGA_MILLIONS
-
-    def __init__(
+    def validate_numbers(self) -> None:
+        """Raise ValueError unless numbers are a valid pick under current rules"""
+        spec = self._spec
+        main_numbers, bonus = self._numbers[:-1], self._numbers[-1]
+        if len(main_numbers) != spec.main_count:
+            raise ValueError(
+                f"Expected {spec.main_count + 1} numbers, got {len(self._numbers)}"
+            )
+        if len(set(main_numbers)) != len(main_numbers):
+            raise ValueError(f"Repeated main numbers in {self._numbers}")
+        if not all(1 <= number <= spec.main_max for number in main_numbers):
+            raise ValueError(f"Main numbers must be 1-{spec.main_max}")
+        if not 1 <= bonus <= spec.bonus_max:
+            raise ValueError(f"{spec.bonus_name} must be 1-{spec.bonus_max}")
+
+    def format_result(self, result: TicketResult) -> str:
+        """Get a message containing winnings information for an evaluated drawing"""
+        return f"{result.drawing_date} : {self._spec.display_name} ticket {self.numbers}\n \
+            winning_numbers {result.winning_numbers}\n \
+            hits: {result.matches}, {self._spec.bonus_name} {result.bonus_hit}\n \
+            winnings: ${result.prize} \n\n"
+
+    def evaluate(
         self,
-        start_date: str,
-        end_date: str,
-        numbers: List[int],
-        ticket_id: Optional[int] = None,
-    ) -> None:
-        super(MegaMillionsTicket, self).__init__(
-            start_date, end_date, numbers, ticket_id=ticket_id
-        )
-        assert len(self._numbers), f"Expected 6, got {len(self._numbers)}"
-        self._lotto_type = LottoType.MEGA_MILLIONS
-
-    def check_winnings(self, drawing_date: str, winning_numbers: List[int]) -> str:
-        """Get a message containing winnings information"""
-        mb = winning_numbers[-1] == self.numbers[-1]
+        drawing_date: str,
+        winning_numbers: List[int],
+        multiplier: Optional[int] = None,
+    ) -> TicketResult:
+        """Score this ticket against a drawing"""
+        bonus_hit = winning_numbers[-1] == self._numbers[-1]
+        main_numbers = self._numbers[:-1]
         matches = 0
         for winning_number in winning_numbers[:-1]:
-            if winning_number in self._numbers[:-1]:
+            if winning_number in main_numbers:
                 matches += 1
 
-        winnings: int
-        if mb:
-            winnings = {0: 2, 1: 4, 2: 10, 3: 200, 4: 10000, 5: 1000000}[matches]
-        else:
-            winnings = {0: 0, 1: 0, 2: 0, 3: 10, 4: 500, 5: 1000000}[matches]
-        return f"{drawing_date} : MegaMillions ticket {self.numbers}\n \
-            winning_numbers {winning_numbers}\n \
-            hits: {matches}, megaball {mb}\n \
-            winnings: ${winnings} \n\n"
-
-    @property
-    def lotto_type(self) -> LottoType:
-        return MegaMillionsTicket.LOTTO_TYPE
-
-
-class PowerballTicket(LotteryTicket):
-    LOTTO_TYPE = LottoType.POWERBALL
-
-    def __init__(
-        self,
-        start_date: str,
-        end_date: str,
-        numbers: List[int],
-        ticket_id: Optional[int] = None,
-    ) -> None:
-        super(PowerballTicket, self).__init__(
-            start_date, end_date, numbers, ticket_id=ticket_id
+        prizes = self._spec.bonus_prizes if bonus_hit else self._spec.prizes
+        return TicketResult(
+            self._ticket_id,
+            drawing_date,
+            winning_numbers,
+            matches,
+            bonus_hit,
+            multiplier,
+            prizes[matches],
         )
-        assert len(self._numbers), f"Expected 6, got {len(self._numbers)}"
-
-    def check_winnings(self, drawing_date: str, winning_numbers: List[int]) -> str:
-        """Get a message containing winnings information"""
-        pb = winning_numbers[-1] == self.numbers[-1]
-        matches = 0
-        for winning_number in winning_numbers[:-1]:
-            if winning_number in self._numbers[:-1]:
-                matches += 1
-
-        winnings: int
-        if pb:
-            winnings = {0: 4, 1: 4, 2: 7, 3: 100, 4: 50000, 5: 1000000}[matches]
-        else:
-            winnings = {0: 0, 1: 0, 2: 0, 3: 7, 4: 100, 5: 1000000}[matches]
-        return f"{drawing_date} : Powerball ticket {self.numbers}\n \
-            winning_numbers {winning_numbers}\n \
-            hits: {matches}, powerball {pb}\n \
-            winnings: ${winnings} \n\n"
-
-    @property
-    def lotto_type(self) -> LottoType:
-        return PowerballTicket.LOTTO_TYPE
 
 
 class TicketLoader:
@@ -147,11 +128,12 @@ class TicketLoader:
         numbers: List[int],
         ticket_id: Optional[int] = None,
     ) -> LotteryTicket:
+        return LotteryTicket(
+            get_game(lotto_name), start_date, end_date, numbers, ticket_id=ticket_id
+        )
 
-        if LottoType(lotto_name) == LottoType.MEGA_MILLIONS:
-            return MegaMillionsTicket(
-                start_date, end_date, numbers, ticket_id=ticket_id
-            )
-        elif LottoType(lotto_name) == LottoType.POWERBALL:
-            return PowerballTicket(start_date, end_date, numbers, ticket_id=ticket_id)
-        raise ValueError(f"Unknown lotto_name {lotto_name}")
+
+@lru_cache(maxsize=4096)
+def _get_date(date: str) -> arrow.Arrow:
+    """Parse a ticket date; tickets share few distinct dates and parsing is slow"""
+    return arrow.get(date)
@@ -5,6 +5,8 @@ from distutils.core import setup
 
 import setuptools
 
+from lotto.games import BUILTIN_GAMES
+
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
@@ -18,4 +20,7 @@ setup(name='lotto',
       packages=setuptools.find_packages(exclude=["test"]),
       install_requires=requirements,
       python_requires="~=3.11",
+      entry_points={
+          "lotto.games": [f"{name} = {path}" for name, path in BUILTIN_GAMES.items()],
+      },
       )
@@ -0,0 +1,165 @@
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+import arrow
+import pytest
+from click.testing import CliRunner
+
+from lotto import cli
+from lotto.db import (
+    acquire_lease,
+    add_ticket_to_tickets_table,
+    check_index_exists,
+    claim_schedule_pairs,
+    create_lease_table,
+    create_schedule_table,
+    get_connection,
+    release_lease,
+)
+
+POWERBALL_ROWS = [
+    {
+        "draw_date": f"2023-01-{day:02d}T00:00:00.000",
+        "winning_numbers": "01 06 40 51 67 02",
+        "multiplier": "2",
+    }
+    for day in (2, 4, 7)
+]
+MEGA_MILLIONS_ROWS = [
+    {
+        "draw_date": f"2023-01-{day:02d}T00:00:00.000",
+        "winning_numbers": "13 23 24 25 43",
+        "mega_ball": "02",
+        "multiplier": "03",
+    }
+    for day in (3, 6)
+]
+
+
+class FakeResponse:
+    def __init__(self, rows: List[Dict[str, str]]) -> None:
+        self._rows = rows
+
+    def json(self) -> List[Dict[str, str]]:
+        return self._rows
+
+
+def fake_get(url: str, *args: Any, **kwargs: Any) -> FakeResponse:
+    return FakeResponse(POWERBALL_ROWS if "d6yy-54nr" in url else MEGA_MILLIONS_ROWS)
+
+
+@pytest.fixture
+def db_path(tmp_path: Any, monkeypatch: Any) -> str:
+    monkeypatch.setattr("lotto.drawings.requests.get", fake_get)
+    path = str(tmp_path / "database.db")
+    assert CliRunner().invoke(cli.setup, ["--db-path", path]).exit_code == 0
+    conn = get_connection(path)
+    add_ticket_to_tickets_table(
+        conn,
+        cli.TICKET_TABLE_NAME,
+        "powerball",
+        "20230101",
+        "20230131",
+        [1, 6, 40, 3, 4, 2],
+    )
+    add_ticket_to_tickets_table(
+        conn,
+        cli.TICKET_TABLE_NAME,
+        "mega_millions",
+        "20230101",
+        "20230131",
+        [13, 23, 24, 25, 43, 2],
+    )
+    return path
+
+
+def test_claim_schedule_pairs_only_once(db_path: str) -> None:
+    first, second = get_connection(db_path), get_connection(db_path)
+    pairs = [(1, arrow.get("2023-01-02")), (1, arrow.get("2023-01-04"))]
+    with first:
+        assert claim_schedule_pairs(first, cli.SCHEDULE_TABLE_NAME, pairs) == {
+            (1, "20230102"),
+            (1, "20230104"),
+        }
+    with second:
+        assert claim_schedule_pairs(second, cli.SCHEDULE_TABLE_NAME, pairs) == set()
+
+
+def test_second_run_reports_nothing(db_path: str, monkeypatch: Any) -> None:
+    notifications: List[str] = []
+    monkeypatch.setattr(
+        cli, "_notify", lambda message, *args: notifications.append(message)
+    )
+    args = ["-s", "2023-01-01", "-e", "2023-01-31", "--db-path", db_path]
+    assert CliRunner().invoke(cli.check, args).exit_code == 0
+    assert CliRunner().invoke(cli.check, args + ["--no-lease"]).exit_code == 0
+
+    assert notifications[0].count("ticket") == 5
+    assert notifications[1] == ""
+    conn = sqlite3.connect(db_path)
+    assert conn.execute(
+        f"SELECT COUNT(*) FROM {cli.SCHEDULE_TABLE_NAME}"
+    ).fetchone() == (5,)
+
+
+def test_lease_renewal_and_takeover(tmp_path: Any) -> None:
+    conn = get_connection(str(tmp_path / "lease.db"))
+    create_lease_table(conn, "LeaseTable")
+
+    assert acquire_lease(conn, "LeaseTable", "check", "run-a", 3600)
+    assert not acquire_lease(conn, "LeaseTable", "check", "run-b", 3600)
+    #   The holder renews; an expired lease is taken over
+    assert acquire_lease(conn, "LeaseTable", "check", "run-a", -1)
+    assert acquire_lease(conn, "LeaseTable", "check", "run-b", 3600)
+    assert not acquire_lease(conn, "LeaseTable", "check", "run-a", 3600)
+
+    release_lease(conn, "LeaseTable", "check", "run-a")
+    assert not acquire_lease(conn, "LeaseTable", "check", "run-c", 3600)
+    release_lease(conn, "LeaseTable", "check", "run-b")
+    assert acquire_lease(conn, "LeaseTable", "check", "run-c", 3600)
+
+
+def test_lost_lease_stops_run_and_reports_recorded(
+    db_path: str, monkeypatch: Any
+) -> None:
+    notifications: List[str] = []
+    monkeypatch.setattr(
+        cli, "_notify", lambda message, *args: notifications.append(message)
+    )
+    renewals: List[Tuple[str, int]] = []
+
+    def lose_lease_on_renewal(
+        conn: Any, table: str, name: str, owner: str, ttl: int
+    ) -> bool:
+        renewals.append((owner, ttl))
+        return len(renewals) == 1
+
+    monkeypatch.setattr(cli, "acquire_lease", lose_lease_on_renewal)
+    result = CliRunner().invoke(
+        cli.check, ["--since-last", "-e", "2023-01-31", "--db-path", db_path]
+    )
+
+    assert isinstance(result.exception, RuntimeError)
+    #   The first game was recorded before the lease was lost, and still reported
+    assert len(notifications) == 1 and notifications[0].count("ticket") in (2, 3)
+
+
+def test_create_schedule_table_removes_duplicates(tmp_path: Any) -> None:
+    conn = sqlite3.connect(str(tmp_path / "schedule.db"))
+    conn.execute(
+        "CREATE TABLE ScheduleTable (ScheduleDate varchar(255), TicketKey varchar(255))"
+    )
+    conn.executemany(
+        "INSERT INTO ScheduleTable VALUES (?, ?)",
+        [("20230102", "1"), ("20230102", "1"), ("20230104", "1"), ("20230102", "2")],
+    )
+    create_schedule_table(conn, "ScheduleTable")
+
+    assert sorted(conn.execute("SELECT * FROM ScheduleTable").fetchall()) == [
+        ("20230102", "1"),
+        ("20230102", "2"),
+        ("20230104", "1"),
+    ]
+    assert check_index_exists(conn, "ScheduleTableClaim")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO ScheduleTable VALUES ('20230102', '1')")
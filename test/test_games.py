@@ -0,0 +1,159 @@
+import random
+from typing import Any, Callable, List, NamedTuple
+
+import pytest
+
+from lotto import games
+from lotto.drawings import parse_drawings
+from lotto.games import BUILTIN_GAMES, GameRegistry, GameSpec, get_game
+from lotto.tickets import LotteryTicket
+
+#   Prize tables of the per-game ticket classes that GameSpec replaced
+PREVIOUS_PRIZES = {
+    "mega_millions": (
+        {0: 0, 1: 0, 2: 0, 3: 10, 4: 500, 5: 1000000},
+        {0: 2, 1: 4, 2: 10, 3: 200, 4: 10000, 5: 1000000},
+    ),
+    "powerball": (
+        {0: 0, 1: 0, 2: 0, 3: 7, 4: 100, 5: 1000000},
+        {0: 4, 1: 4, 2: 7, 3: 100, 4: 50000, 5: 1000000},
+    ),
+}
+TAKE5 = GameSpec(
+    name="take5",
+    display_name="Take 5",
+    bonus_name="bonus",
+    dataset_id="dg63-4siq",
+    numbers_field="winning_numbers",
+    bonus_field=None,
+    multiplier_field=None,
+    main_count=4,
+    main_max=39,
+    bonus_max=39,
+    prizes=(0, 0, 1, 20, 500),
+    bonus_prizes=(0, 0, 1, 20, 500),
+)
+
+
+class FakeEntryPoint(NamedTuple):
+    name: str
+    load: Callable[[], Any]
+
+
+def fake_entry_points(*found: FakeEntryPoint) -> Callable[..., List[FakeEntryPoint]]:
+    return lambda group: list(found)
+
+
+def test_builtin_games_load_by_name() -> None:
+    for name in BUILTIN_GAMES:
+        spec = get_game(name)
+        assert isinstance(spec, GameSpec) and spec.name == name
+        assert len(spec.prizes) == len(spec.bonus_prizes) == spec.main_count + 1
+    assert get_game("powerball").url == "https://data.ny.gov/resource/d6yy-54nr.json"
+
+
+def test_unknown_game_raises(monkeypatch: Any) -> None:
+    monkeypatch.setattr(games, "entry_points", fake_entry_points())
+    with pytest.raises(ValueError, match="Unknown lotto_name take5"):
+        GameRegistry().get("take5")
+
+
+def test_entry_point_games_are_discovered(monkeypatch: Any) -> None:
+    monkeypatch.setattr(
+        games,
+        "entry_points",
+        fake_entry_points(
+            FakeEntryPoint("take5", lambda: TAKE5),
+            FakeEntryPoint("powerball", lambda: TAKE5._replace(name="powerball")),
+            FakeEntryPoint("pick10", lambda: "not a spec"),
+        ),
+    )
+    registry = GameRegistry()
+
+    assert registry.names() == sorted(["pick10", "take5", *BUILTIN_GAMES])
+    assert registry.get("take5") is TAKE5
+    #   Built-in games win over entry points of the same name
+    assert registry.get("powerball").display_name == "Powerball"
+    with pytest.raises(ValueError, match="not a GameSpec named pick10"):
+        registry.get("pick10")
+
+
+def test_register_game(monkeypatch: Any) -> None:
+    monkeypatch.setattr(games, "entry_points", fake_entry_points())
+    registry = GameRegistry()
+    registry.register(TAKE5)
+    assert registry.get("take5") is TAKE5
+
+
+def test_parse_drawings_bonus_and_multiplier_fields() -> None:
+    powerball_rows = [
+        {
+            "draw_date": f"2022-11-{day}T00:00:00.000",
+            "winning_numbers": "01 06 40 51 67 02",
+            "multiplier": multiplier,
+        }
+        for day, multiplier in (("19", "3"), ("21", "2"), ("23", None))
+    ]
+    drawings, multipliers = parse_drawings(
+        get_game("powerball"), powerball_rows, "2022-11-20", "2022-11-23"
+    )
+    assert drawings == {
+        "2022-11-21": [1, 6, 40, 51, 67, 2],
+        "2022-11-23": [1, 6, 40, 51, 67, 2],
+    }
+    assert multipliers == {"2022-11-21": 2, "2022-11-23": None}
+
+    mega_millions_rows = [
+        {
+            "draw_date": "2022-11-22T00:00:00.000",
+            "winning_numbers": "13 23 24 25 43",
+            "mega_ball": "02",
+            "multiplier": "03",
+        }
+    ]
+    drawings, multipliers = parse_drawings(
+        get_game("mega_millions"), mega_millions_rows, "2022-11-22", "2022-11-22"
+    )
+    assert drawings == {"2022-11-22": [13, 23, 24, 25, 43, 2]}
+    assert multipliers == {"2022-11-22": 3}
+
+    cash4life_rows = [
+        {
+            "draw_date": "2022-11-21T00:00:00.000",
+            "winning_numbers": "05 10 17 43 56",
+            "cash_ball": "01",
+        }
+    ]
+    drawings, multipliers = parse_drawings(
+        get_game("cash4life"), cash4life_rows, "2022-11-01", "2022-11-30"
+    )
+    assert drawings == {"2022-11-21": [5, 10, 17, 43, 56, 1]}
+    assert multipliers == {"2022-11-21": None}
+
+
+@pytest.mark.parametrize("lotto_name", sorted(PREVIOUS_PRIZES))
+def test_scoring_matches_previous_ticket_classes(lotto_name: str) -> None:
+    spec = get_game(lotto_name)
+    prizes, bonus_prizes = PREVIOUS_PRIZES[lotto_name]
+    rng = random.Random(lotto_name)
+    #   Small ranges so every match count, with and without the bonus, occurs
+    main_max, bonus_max = spec.main_count + 4, 2
+    for _ in range(40000):
+        numbers = rng.sample(range(1, main_max + 1), spec.main_count) + [
+            rng.randint(1, bonus_max)
+        ]
+        winning_numbers = rng.sample(range(1, main_max + 1), spec.main_count) + [
+            rng.randint(1, bonus_max)
+        ]
+        bonus_hit = winning_numbers[-1] == numbers[-1]
+        matches = len(set(winning_numbers[:-1]) & set(numbers[:-1]))
+
+        ticket = LotteryTicket(spec, "2022-11-01", "2022-11-30", numbers, 1)
+        result = ticket.evaluate("2022-11-21", winning_numbers, 2)
+        assert result.matches == matches
+        assert result.bonus_hit == bonus_hit
+        assert result.multiplier == 2
+        assert result.prize == (bonus_prizes if bonus_hit else prizes)[matches]
+        assert f"hits: {matches}, {spec.bonus_name} {bonus_hit}" in (
+            ticket.format_result(result)
+        )
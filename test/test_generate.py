@@ -0,0 +1,80 @@
+import random
+from itertools import combinations
+from typing import Any
+
+import arrow
+import pytest
+from click.testing import CliRunner
+
+from lotto import cli
+from lotto.db import get_connection, query_ticket_numbers
+from lotto.generate import canonical_ticket, quick_picks, wheel
+
+
+def test_canonical_ticket_sorts_main_numbers_only() -> None:
+    assert canonical_ticket([40, 6, 1, 67, 51, 2]) == (1, 6, 40, 51, 67, 2)
+    assert canonical_ticket(map(int, "13 9 2".split())) == (9, 13, 2)
+
+
+def test_quick_picks_are_unique_and_valid() -> None:
+    held = {(1, 2, 3, 4, 5, 1)}
+    tickets = quick_picks(5000, 5, 69, 26, held, random.Random(3))
+
+    assert len(tickets) == 5000
+    assert len(set(tickets)) == 5000
+    assert not held & set(tickets)
+    for ticket in tickets:
+        assert list(ticket[:-1]) == sorted(set(ticket[:-1]))
+        assert all(1 <= number <= 69 for number in ticket[:-1])
+        assert 1 <= ticket[-1] <= 26
+
+
+def test_quick_picks_exhausts_small_game() -> None:
+    #   C(5, 3) * 2 = 20 possible tickets
+    tickets = quick_picks(20, 3, 5, 2, rng=random.Random(1))
+    assert len(set(tickets)) == 20
+    with pytest.raises(ValueError):
+        quick_picks(20, 3, 5, 2, {tickets[0]}, random.Random(1))
+
+
+@pytest.mark.parametrize("pool_size, guarantee", [(8, 3), (10, 3), (10, 4), (12, 2)])
+def test_wheel_covers_every_guarantee_subset(pool_size: int, guarantee: int) -> None:
+    numbers = list(range(3, 3 + 4 * pool_size, 4))
+    tickets = wheel(numbers, 5, guarantee, 7, 26)
+
+    covered = {
+        subset for ticket in tickets for subset in combinations(ticket[:-1], guarantee)
+    }
+    assert covered == set(combinations(numbers, guarantee))
+    assert all(ticket[-1] == 7 for ticket in tickets)
+    assert len(tickets) < len(list(combinations(numbers, 5)))
+
+
+def test_wheel_rejects_bad_guarantee() -> None:
+    with pytest.raises(ValueError):
+        wheel([1, 2, 3, 4, 5, 6], 5, 6, None, 26)
+
+
+def test_generate_skips_held_tickets(tmp_path: Any) -> None:
+    db_path = str(tmp_path / "database.db")
+    runner = CliRunner()
+    assert runner.invoke(cli.setup, ["--db-path", db_path]).exit_code == 0
+    args = ["-l", "powerball", "-s", "20230101", "-e", "20230131", "--db-path", db_path]
+    wheel_args = ["-n", "3", "-n", "8", "-n", "15", "-n", "21", "-n", "33", "-n", "42"]
+    assert runner.invoke(cli.generate, args + wheel_args + ["-b", "7"]).exit_code == 0
+    assert runner.invoke(cli.generate, args + wheel_args + ["-b", "7"]).exit_code == 0
+    assert (
+        runner.invoke(cli.generate, args + ["-c", "50", "--seed", "1"]).exit_code == 0
+    )
+
+    conn = get_connection(db_path)
+    held = query_ticket_numbers(
+        conn,
+        cli.TICKET_TABLE_NAME,
+        "powerball",
+        arrow.get("2023-01-01"),
+        arrow.get("2023-01-31"),
+    )
+    canonical = [canonical_ticket(map(int, numbers.split())) for numbers in held]
+    assert len(canonical) == len(set(canonical))
+    assert len(canonical) > 50
@@ -0,0 +1,83 @@
+import random
+import sqlite3
+from typing import Dict, List
+
+import arrow
+
+from lotto.stats import (
+    BONUS_POOL,
+    MAIN_POOL,
+    create_stats_tables,
+    query_number_counts,
+    query_overdue_numbers,
+    update_stats_tables,
+)
+
+TABLES = ("StatsDraws", "StatsNumbers", "StatsGaps", "StatsPairs")
+
+
+def random_drawings(count: int, seed: int) -> Dict[str, List[int]]:
+    rng = random.Random(seed)
+    first = arrow.get("2010-01-01")
+    return {
+        first.shift(days=3 * i).format("YYYY-MM-DD"): sorted(
+            rng.sample(range(1, 70), 5)
+        )
+        + [rng.randint(1, 26)]
+        for i in range(count)
+    }
+
+
+def table_rows(conn: sqlite3.Connection) -> Dict[str, list]:
+    return {table: sorted(conn.execute(f"SELECT * FROM {table}")) for table in TABLES}
+
+
+def test_incremental_updates_match_full_rebuild() -> None:
+    drawings = random_drawings(3000, seed=7)
+    dates = sorted(drawings.keys())
+
+    full = sqlite3.connect(":memory:")
+    create_stats_tables(full, "Stats")
+    assert update_stats_tables(full, "Stats", "powerball", drawings) == 3000
+
+    incremental = sqlite3.connect(":memory:")
+    create_stats_tables(incremental, "Stats")
+    rng = random.Random(11)
+    end = 0
+    while end < len(dates):
+        end = min(len(dates), end + rng.randint(1, 200))
+        #   Batches overlap earlier drawings, which must be ignored
+        batch = {date: drawings[date] for date in dates[max(0, end - 250) : end]}
+        update_stats_tables(incremental, "Stats", "powerball", batch)
+
+    assert table_rows(incremental) == table_rows(full)
+    assert update_stats_tables(incremental, "Stats", "powerball", drawings) == 0
+
+
+def test_number_queries_cover_current_ranges_only() -> None:
+    conn = sqlite3.connect(":memory:")
+    create_stats_tables(conn, "Stats")
+    #   The first drawing uses numbers retired from Mega Millions (main 71-75, MB 25)
+    update_stats_tables(
+        conn,
+        "Stats",
+        "mega_millions",
+        {
+            "2015-01-02": [71, 72, 73, 74, 75, 25],
+            "2023-01-03": [1, 2, 3, 4, 5, 6],
+            "2023-01-06": [1, 2, 3, 4, 7, 8],
+        },
+    )
+
+    hot = query_number_counts(conn, "Stats", "mega_millions", MAIN_POOL, 100)
+    assert len(hot) == 70
+    assert hot[:5] == [(1, 2), (2, 2), (3, 2), (4, 2), (5, 1)]
+    cold = query_number_counts(
+        conn, "Stats", "mega_millions", MAIN_POOL, 3, hottest=False
+    )
+    assert cold == [(6, 0), (8, 0), (9, 0)]
+
+    overdue = query_overdue_numbers(conn, "Stats", "mega_millions", BONUS_POOL, 100)
+    assert len(overdue) == 24
+    assert overdue[0] == (1, 3, None)
+    assert overdue[-2:] == [(6, 1, "20230103"), (8, 0, "20230106")]